@@ -1 +1,2 @@
-from . import auth, cars, rentals, users
\ No newline at end of file
+# analytics, archive, audit, events and live are left out: app.core.lazy_routers imports them on first use.
+from . import auth, cars, maintenance, payment, reference, rentals, users
@@ -0,0 +1,102 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.api.auth import get_current_user
+from app.models.user import User
+from app.core.sharding import shard_router
+from app.models.analytics import CarTypeDailyStats
+from app.models.car import Car
+from app.schemas.analytics import AnalyticsPeriod, RevenueRowSchema, UtilizationResponseSchema
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+def check_date_range(date_from: date, date_to: date) -> None:
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+
+
+@router.get("/revenue", response_model=List[RevenueRowSchema])
+def get_revenue(date_from: date = Query(..., alias="from"), date_to: date = Query(..., alias="to"),
+                period: AnalyticsPeriod = Query(AnalyticsPeriod.MONTH), type_id: int | None = None,
+                current_user: User = Depends(get_current_user)):
+    if current_user.role != "ADMIN":
+        raise HTTPException(status_code=403, detail="Not allowed")
+    check_date_range(date_from, date_to)
+
+    def branch_rows(db: Session) -> list:
+        query = db.query(
+            CarTypeDailyStats.day,
+            CarTypeDailyStats.type_id,
+            CarTypeDailyStats.rentals_finished,
+            CarTypeDailyStats.billed_amount,
+            CarTypeDailyStats.paid_amount,
+        ).filter(CarTypeDailyStats.day >= date_from, CarTypeDailyStats.day <= date_to)
+        if type_id is not None:
+            query = query.filter(CarTypeDailyStats.type_id == type_id)
+        return query.all()
+
+    # Each branch keeps its own rollups; rows for the same period and type are summed across branches.
+    totals = defaultdict(lambda: [0, Decimal(0), Decimal(0)])
+    rows = [row for branch in shard_router.fan_out(branch_rows) for row in branch]
+    for day, row_type_id, rentals_finished, billed_amount, paid_amount in rows:
+        key = (day.strftime("%Y-%m") if period == AnalyticsPeriod.MONTH else day.isoformat(), row_type_id)
+        totals[key][0] += rentals_finished
+        totals[key][1] += Decimal(billed_amount)
+        totals[key][2] += Decimal(paid_amount)
+
+    return [
+        {"period": key_period, "type_id": key_type_id, "rentals_finished": rentals,
+         "billed_amount": billed, "paid_amount": paid}
+        for (key_period, key_type_id), (rentals, billed, paid) in sorted(totals.items())
+    ]
+
+
+@router.get("/utilization", response_model=UtilizationResponseSchema)
+def get_utilization(date_from: date = Query(..., alias="from"), date_to: date = Query(..., alias="to"),
+                    current_user: User = Depends(get_current_user)):
+    if current_user.role != "ADMIN":
+        raise HTTPException(status_code=403, detail="Not allowed")
+    check_date_range(date_from, date_to)
+
+    def branch_totals(db: Session) -> tuple[list, list]:
+        booked = (
+            db.query(CarTypeDailyStats.type_id, func.sum(CarTypeDailyStats.booked_hours))
+            .filter(CarTypeDailyStats.day >= date_from, CarTypeDailyStats.day <= date_to)
+            .group_by(CarTypeDailyStats.type_id)
+            .all()
+        )
+        fleet = (
+            db.query(Car.type_id, func.count(Car.id))
+            .filter(Car.status != "DISABLED", Car.type_id.is_not(None))
+            .group_by(Car.type_id)
+            .all()
+        )
+        return booked, fleet
+
+    booked, fleet = defaultdict(float), defaultdict(int)
+    for branch_booked, branch_fleet in shard_router.fan_out(branch_totals):
+        for row_type_id, hours in branch_booked:
+            booked[row_type_id] += float(hours or 0)
+        for row_type_id, cars in branch_fleet:
+            fleet[row_type_id] += cars
+
+    hours_in_range = ((date_to - date_from).days + 1) * 24
+    items = []
+    for row_type_id in sorted(set(booked) | set(fleet)):
+        cars = fleet.get(row_type_id, 0)
+        booked_hours = float(booked.get(row_type_id) or 0)
+        available_hours = float(cars * hours_in_range)
+        items.append({
+            "type_id": row_type_id,
+            "cars": cars,
+            "booked_hours": round(booked_hours, 2),
+            "available_hours": available_hours,
+            "utilization": round(booked_hours / available_hours, 4) if available_hours else 0.0,
+        })
+
+    return {"date_from": date_from, "date_to": date_to, "items": items}
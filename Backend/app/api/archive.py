@@ -0,0 +1,49 @@
+from datetime import datetime
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session, selectinload
+from app.api.auth import get_current_user
+from app.models.user import User
+from app.core.sharding import get_rental_db, shard_router
+from app.models.archive import ArchivedRental
+from app.schemas.rental import ArchivedRentalSchema
+
+router = APIRouter(prefix="/archive", tags=["archive"])
+
+
+@router.get("/rentals", response_model=List[ArchivedRentalSchema])
+def list_archived_rentals(current_user: User = Depends(get_current_user),
+                          user_id: int | None = None, car_id: int | None = None,
+                          ended_from: datetime | None = None, ended_to: datetime | None = None,
+                          page: int = Query(1, ge=1), limit: int = Query(50, ge=1, le=500)):
+    if current_user.role != "ADMIN":
+        if user_id is not None and user_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Not allowed")
+        user_id = current_user.id
+
+    offset = (page - 1) * limit
+
+    def branch_page(db: Session) -> list[ArchivedRental]:
+        query = db.query(ArchivedRental).options(selectinload(ArchivedRental.payment))
+        if user_id is not None:
+            query = query.filter(ArchivedRental.user_id == user_id)
+        if car_id is not None:
+            query = query.filter(ArchivedRental.car_id == car_id)
+        if ended_from is not None:
+            query = query.filter(ArchivedRental.end_date >= ended_from)
+        if ended_to is not None:
+            query = query.filter(ArchivedRental.end_date < ended_to)
+        return query.order_by(ArchivedRental.end_date.desc()).limit(offset + limit).all()
+
+    rentals = sorted((r for page in shard_router.fan_out(branch_page) for r in page), key=lambda r: r.end_date, reverse=True)
+    return rentals[offset:offset + limit]
+
+
+@router.get("/rentals/{rental_id}", response_model=ArchivedRentalSchema)
+def get_archived_rental(rental_id: int, db: Session = Depends(get_rental_db), current_user: User = Depends(get_current_user)):
+    rental = db.query(ArchivedRental).filter(ArchivedRental.id == rental_id).first()
+    if rental is None:
+        raise HTTPException(status_code=404, detail="Rental not found")
+    if rental.user_id != current_user.id and current_user.role != "ADMIN":
+        raise HTTPException(status_code=403, detail="Not allowed")
+    return rental
@@ -7,15 +7,12 @@ from starlette import status
 from app.core.database import get_db
 from app.models.user import User
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from jose import JWTError, jwt
 import os
-from app.core.security import verify_password, get_password_hash
+from app.core.security import ALGORITHM, SECRET_KEY, verify_password, get_password_hash
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-SECRET_KEY = os.getenv("SECRET_KEY", "your_secret_key")
-ALGORITHM = "HS256"
 DEFAULT_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "20"))
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
@@ -59,6 +56,8 @@ def authenticate_user(email: str, password: str, db: Session):
 
 
 def create_access_token(email: str, user_id: int, role: str, expires_delta: timedelta):
+    from jose import jwt
+
     encode = {'sub': email, 'id': user_id, 'role': role}
     expires = datetime.utcnow() + expires_delta
     encode.update({'exp': expires})
@@ -67,6 +66,9 @@ def create_access_token(email: str, user_id: int, role: str, expires_delta: time
 
 
 async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: db_dependency):
+    # jose pulls in its crypto backends; import it with the first authenticated request.
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get('sub')
@@ -1,28 +1,168 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy import false, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, load_only, selectinload
 from app.core.database import get_db
-from app.models.car import Car, CarImage, Tag, CarType, FuelType, GearboxType
+from app.core.audit import audit_log
+from app.core.http_cache import bump_collection_version, get_collection_version, make_etag, is_not_modified, not_modified, set_cache_headers
+from app.core.invalidation import invalidation_bus
+from app.core.fleet_snapshot import FleetQuery, fleet_snapshot
+from app.core.maintenance import due_car_ids
+from app.core.outbox import record_event, car_payload
+from app.core.reference_data import reference_data, mark_changed
+from app.core.sharding import get_branch_db, get_car_db, shard_router, sync_reference_data
+from app.core.similarity import fleet_features_for, mark_features_changed
+from app.models.car import Car, CarImage, CarTags, Tag
+from app.models.rental import Rental
 from app.schemas.car import CarCreateSchema, CarResponseSchema, CarUpdateSchema, CarFilterSchema, PaginatedCarResponse
+from app.schemas.car import CAR_SCALAR_FIELDS, CAR_RELATION_FIELDS, car_projection_schema
 from app.api.auth import get_current_user
 from app.api.auth import User
 
 router = APIRouter(prefix="/cars", tags=["cars"])
 
 
+def parse_field_list(raw: str, allowed: tuple[str, ...], param: str) -> tuple[str, ...]:
+    requested = []
+    for raw_field in raw.split(","):
+        field = raw_field.strip()
+        if not field:
+            continue
+        if field not in allowed:
+            raise HTTPException(status_code=400, detail=f"Invalid {param} value: {field}")
+        if field not in requested:
+            requested.append(field)
+    # Keep the schema's order so equivalent requests share one cached projection schema.
+    return tuple(name for name in allowed if name in requested)
+
+
 @router.get("/{car_id}", response_model=CarResponseSchema)
-def get_car(car_id: int, db: Session = Depends(get_db)):
-    car_db = db.query(Car).filter(Car.id == car_id).first()
+def get_car(car_id: int, request: Request, response: Response, db: Session = Depends(get_car_db)):
+    car_meta = db.query(Car.version, Car.updated_at).filter(Car.id == car_id).first()
 
-    if not car_db:
+    if not car_meta:
         raise HTTPException(status_code=404, detail="Car not found")
 
+    etag = make_etag("car", car_id, car_meta.version)
+    if is_not_modified(request, etag, car_meta.updated_at):
+        return not_modified(etag, car_meta.updated_at)
+
+    car_db = db.query(Car).filter(Car.id == car_id).first()
+    set_cache_headers(response, etag, car_meta.updated_at)
+
     return car_db
 
 
+def available_car_ids(db: Session, car_ids: list[int], date_from: datetime, date_to: datetime) -> list[int]:
+    """The given cars that are bookable for the whole window, in the given order."""
+    if not car_ids:
+        return []
+    booked = select(Rental.car_id).where(
+        Rental.car_id.in_(car_ids),
+        Rental.status != "CANCELLED",
+        Rental.end_date > date_from,
+        Rental.start_date < date_to,
+    )
+    available = set(db.scalars(
+        select(Car.id).where(Car.id.in_(car_ids), Car.status == "AVAILABLE",
+                             Car.id.not_in(due_car_ids()), Car.id.not_in(booked))
+    ))
+    return [car_id for car_id in car_ids if car_id in available]
+
+
+@router.get("/{car_id}/alternatives", response_model=List[CarResponseSchema])
+def get_alternatives(car_id: int, date_from: datetime = Query(..., alias="from"), date_to: datetime = Query(..., alias="to"),
+                     limit: int = Query(5, ge=1, le=20), db: Session = Depends(get_car_db)):
+    if date_from >= date_to:
+        raise HTTPException(status_code=400, detail="'to' must be after 'from'")
+    if db.query(Car.id).filter(Car.id == car_id).first() is None:
+        raise HTTPException(status_code=404, detail="Car not found")
+
+    # Rank more candidates than needed so a few booked ones do not leave the answer short;
+    # the whole fleet is only scored when same-type cars in the price band run out.
+    alternatives = []
+    features = fleet_features_for(db)
+    for widen in (False, True):
+        ranked = [i for i in features.top(db, car_id, limit * 10, widen) if i not in alternatives]
+        alternatives += available_car_ids(db, ranked, date_from, date_to)[:limit - len(alternatives)]
+        if len(alternatives) >= limit:
+            break
+
+    cars = {car.id: car for car in db.query(Car).filter(Car.id.in_(alternatives))}
+    return [cars[i] for i in alternatives if i in cars]
+
+
+def resolve_filters(db: Session, filters: CarFilterSchema) -> FleetQuery | None:
+    """Resolve reference names to ids from the cache, so no joins are needed. None means nothing can match."""
+    spec = FleetQuery(price_from=filters.price_from, price_to=filters.price_to, seats=filters.seats)
+    for name, kind, field in ((filters.type, "car_types", "type_id"),
+                              (filters.fuel, "fuel_types", "fuel_id"),
+                              (filters.gearbox, "gearbox_types", "gearbox_id")):
+        if name:
+            ref_id = reference_data.id_for(db, kind, name)
+            if ref_id is None:
+                return None
+            setattr(spec, field, ref_id)
+    if filters.tags:
+        tag_ids = [reference_data.id_for(db, "tags", tag_name) for tag_name in filters.tags]
+        if None in tag_ids:
+            return None
+        spec.tag_ids = tuple(tag_ids)
+    return spec
+
+
+def filtered_cars(db: Session, spec: FleetQuery | None, order_by: list):
+    query = db.query(Car).filter(Car.status == "AVAILABLE", Car.id.not_in(due_car_ids()))
+    if spec is None:
+        return query.filter(false())
+
+    for column, value in ((Car.type_id, spec.type_id), (Car.fuel_id, spec.fuel_id),
+                          (Car.gearbox_id, spec.gearbox_id), (Car.seats, spec.seats)):
+        if value is not None:
+            query = query.filter(column == value)
+    if spec.price_from is not None:
+        query = query.filter(Car.price_per_day >= spec.price_from)
+    if spec.price_to is not None:
+        query = query.filter(Car.price_per_day <= spec.price_to)
+    for tag_id in spec.tag_ids:
+        query = query.filter(Car.id.in_(select(CarTags.car_id).where(CarTags.tag_id == tag_id)))
+
+    if order_by:
+        query = query.order_by(*order_by)
+    return query
+
+
+def sort_value(car: Car, name: str):
+    value = getattr(car, name)
+    # NULLs first, as SQLite orders them.
+    return (0,) if value is None else (1, value)
+
+
+def list_cars_all_branches(spec: FleetQuery | None, order_by: list, sort_keys: list[tuple[str, bool]],
+                           offset: int, limit: int, options: list) -> tuple[int, list[Car]]:
+    """Run the catalog query on every branch in parallel and merge the pages in the requested order."""
+    def branch_page(db: Session):
+        query = filtered_cars(db, spec, order_by)
+        return query.distinct(Car.id).count(), query.options(*options).distinct(Car.id).limit(offset + limit).all()
+
+    results = shard_router.fan_out(branch_page)
+    cars = [car for _, branch_cars in results for car in branch_cars]
+    for name, descending in reversed(sort_keys):
+        cars.sort(key=lambda car: sort_value(car, name), reverse=descending)
+    return sum(total for total, _ in results), cars[offset:offset + limit]
+
+
 @router.get("/", response_model=PaginatedCarResponse)
-def list_cars(filters: CarFilterSchema = Depends(), db: Session = Depends(get_db), 
+def list_cars(request: Request, response: Response,
+              filters: CarFilterSchema = Depends(), db: Session = Depends(get_db), 
+              branch: str | None = Header(None, alias="X-Branch"), branch_db: Session = Depends(get_branch_db),
               page: int = Query(1, ge=1), limit: int = Query(10, ge=1, le=100),
-              sort: str = Query("price_per_day")):
+              sort: str = Query("price_per_day"),
+              fields: str | None = Query(None, description="Comma-separated car fields to return"),
+              expand: str | None = Query(None, description="Comma-separated relations to embed: car_type, fuel_type, gearbox_type, images, tags")):
     allowed_sort_fields = {"price_per_day": Car.price_per_day, 
                            "year": Car.year, 
                            "mileage": Car.mileage, 
@@ -32,6 +172,7 @@ def list_cars(filters: CarFilterSchema = Depends(), db: Session = Depends(get_db
                            "doors": Car.doors}
     
     order_by = []
+    sort_keys = []
 
     for raw_field in sort.split(","):
         field = raw_field.strip()
@@ -45,48 +186,105 @@ def list_cars(filters: CarFilterSchema = Depends(), db: Session = Depends(get_db
 
         column = allowed_sort_fields[field_name]
         order_by.append(column.desc() if desc else column.asc())
-
-    query = db.query(Car).filter(Car.status == "AVAILABLE")
-
-    if filters.type:
-        query = query.join(Car.car_type).filter(CarType.name == filters.type)
-    if filters.fuel:
-        query = query.join(Car.fuel_type).filter(FuelType.name == filters.fuel)
-    if filters.gearbox:
-        query = query.join(Car.gearbox_type).filter(GearboxType.name == filters.gearbox)
-    if filters.price_from is not None:
-        query = query.filter(Car.price_per_day >= filters.price_from)
-    if filters.price_to is not None:
-        query = query.filter(Car.price_per_day <= filters.price_to)
-    if filters.seats is not None:
-        query = query.filter(Car.seats == filters.seats)
-    if filters.tags:
-        for tag_name in filters.tags:
-            query = query.filter(Car.tags.any(Tag.name == tag_name))
-
-    if order_by:
-        query = query.order_by(*order_by)
-
-    total = query.distinct(Car.id).count()
-    cars = query.distinct(Car.id).offset((page - 1) * limit).limit(limit).all()
-
-    return {
+        sort_keys.append((field_name, desc))
+
+    sparse = fields is not None or expand is not None
+    if sparse:
+        selected_fields = parse_field_list(fields, CAR_SCALAR_FIELDS, "fields") if fields is not None else CAR_SCALAR_FIELDS
+        if "id" not in selected_fields:
+            selected_fields = ("id",) + selected_fields
+        selected_relations = parse_field_list(expand, CAR_RELATION_FIELDS, "expand") if expand is not None else ()
+    else:
+        selected_fields, selected_relations = CAR_SCALAR_FIELDS, CAR_RELATION_FIELDS
+
+    # Without X-Branch a multi-branch deployment answers from every branch.
+    all_branches = shard_router.sharded and branch is None
+    if all_branches:
+        versions = shard_router.fan_out(lambda branch_db: get_collection_version(branch_db, "cars"))
+        collection_version = tuple(version for version, _ in versions)
+        last_modified = max((modified for _, modified in versions if modified is not None), default=None)
+    else:
+        collection_version, last_modified = get_collection_version(branch_db, "cars")
+    etag = make_etag("cars", branch, collection_version, sorted(request.query_params.multi_items()))
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+
+    spec = resolve_filters(db, filters)
+    options = [selectinload(getattr(Car, name)) for name in selected_relations]
+    if sparse:
+        # Many-to-one relations are loaded through their foreign keys, so those stay loaded too.
+        foreign_keys = {"car_type": Car.type_id, "fuel_type": Car.fuel_id, "gearbox_type": Car.gearbox_id}
+        columns = [getattr(Car, name) for name in selected_fields]
+        columns += [foreign_keys[name] for name in selected_relations if name in foreign_keys]
+        # Pages from several branches are merged by the sort keys after the sessions close.
+        columns += [allowed_sort_fields[name] for name, _ in sort_keys if name not in selected_fields]
+        options.append(load_only(*columns))
+
+    offset = (page - 1) * limit
+    if all_branches:
+        total, cars = list_cars_all_branches(spec, order_by, sort_keys, offset, limit, options)
+    elif fleet_snapshot.enabled and not shard_router.sharded:
+        fleet_snapshot.refresh(db, collection_version)
+        total, page_ids = fleet_snapshot.query(spec, sort_keys, offset, limit) if spec is not None else (0, [])
+        cars_by_id = {car.id: car for car in db.query(Car).filter(Car.id.in_(page_ids)).options(*options)}
+        cars = [cars_by_id[car_id] for car_id in page_ids if car_id in cars_by_id]
+    else:
+        query = filtered_cars(branch_db, spec, order_by)
+        total = query.distinct(Car.id).count()
+        cars = query.options(*options).distinct(Car.id).offset(offset).limit(limit).all()
+
+    if not sparse:
+        set_cache_headers(response, etag, last_modified)
+        return {
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "items": cars
+        }
+
+    projection = car_projection_schema(selected_fields, selected_relations)
+    sparse_response = JSONResponse({
         "total": total,
         "page": page,
         "limit": limit,
-        "items": cars
-    }
+        "items": [projection.model_validate(car).model_dump(mode="json") for car in cars]
+    })
+    set_cache_headers(sparse_response, etag, last_modified)
+    return sparse_response
+
+
+def plate_taken(plate: str) -> bool:
+    # Plates are meant to be unique across the whole fleet, not just within a branch. This is
+    # best-effort: branches share no constraint and cars.plate has no unique index, so two
+    # creates or plate changes racing each other can both pass this check.
+    return any(shard_router.fan_out(lambda db: db.query(Car.id).filter(Car.plate == plate).first() is not None))
+
+
+def _get_or_create_tag(db: Session, name: str) -> tuple[int, bool]:
+    """Id of the named tag and whether this call inserted it; the cache may be behind the table."""
+    tag_id = db.query(Tag.id).filter(Tag.name == name).scalar()
+    if tag_id is not None:
+        return tag_id, False
+    try:
+        with db.begin_nested():
+            tag = Tag(name=name)
+            db.add(tag)
+        return tag.id, True
+    except IntegrityError:
+        # Another request created it first.
+        return db.query(Tag.id).filter(Tag.name == name).scalar(), False
 
 
 @router.post("/", response_model=CarResponseSchema)
-def create_car(car: CarCreateSchema, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def create_car(car: CarCreateSchema, ref_db: Session = Depends(get_db), db: Session = Depends(get_branch_db),
+               current_user: User = Depends(get_current_user)):
     if current_user.role not in {"ADMIN", "AGENT"}:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    existing = db.query(Car).filter(Car.plate == car.plate).first()
-    if existing:
+    if plate_taken(car.plate):
         raise HTTPException(status_code=400, detail="Car with this plate already exists")
 
+    sync_reference_data(ref_db, db)
     car_db = Car(
         brand = car.brand,
         model = car.model,
@@ -111,23 +309,37 @@ def create_car(car: CarCreateSchema, db: Session = Depends(get_db), current_user
             img_obj = CarImage(car_id=car_db.id, image_url=img.image_url, is_primary=bool(img.is_primary))
             db.add(img_obj)
 
+    new_tags = []
     if car.tags:
-        for t in car.tags:
-            tag_obj = db.query(Tag).filter(Tag.name == t.name).first()
-            if not tag_obj:
-                tag_obj = Tag(name=t.name)
-                db.add(tag_obj)
-                db.flush()
-            car_db.tags.append(tag_obj)
-
+        for tag_name in dict.fromkeys(t.name for t in car.tags):
+            tag_id = reference_data.id_for(ref_db, "tags", tag_name)
+            if tag_id is None:
+                # Tags are reference data: created in the default branch and mirrored into the car's branch.
+                tag_id, created = _get_or_create_tag(ref_db, tag_name)
+                if created:
+                    new_tags.append(tag_id)
+                if ref_db is not db:
+                    db.merge(Tag(id=tag_id, name=tag_name))
+            db.add(CarTags(car_id=car_db.id, tag_id=tag_id))
+
+    if new_tags:
+        mark_changed(ref_db)
+    mark_features_changed(db)
+    bump_collection_version(db, "cars")
+    record_event(db, "car.created", car_db.id, car_payload(car_db))
+    if ref_db is not db:
+        ref_db.commit()
     db.commit()
+    if new_tags:
+        invalidation_bus.publish("reference_data")
     db.refresh(car_db)
 
     return car_db
 
 
 @router.patch("/{car_id}", response_model=CarResponseSchema)
-def update_car(car_id: int, car: CarUpdateSchema, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def update_car(car_id: int, car: CarUpdateSchema, ref_db: Session = Depends(get_db), db: Session = Depends(get_car_db),
+               current_user: User = Depends(get_current_user)):
     if current_user.role not in {"ADMIN", "AGENT"}:
         raise HTTPException(status_code=403, detail="Not authorized")
     
@@ -137,10 +349,10 @@ def update_car(car_id: int, car: CarUpdateSchema, db: Session = Depends(get_db),
         raise HTTPException(status_code=404, detail="Car not found")
     
     if car.plate and car.plate != car_db.plate:
-        existing = db.query(Car).filter(Car.plate == car.plate).first()
-        if existing:
+        if plate_taken(car.plate):
             raise HTTPException(status_code=400, detail="Car with this plate already exists")
 
+    sync_reference_data(ref_db, db)
     updatable_fields = [
         "brand",
         "model",
@@ -157,20 +369,27 @@ def update_car(car_id: int, car: CarUpdateSchema, db: Session = Depends(get_db),
         "plate",
     ]
 
+    changes = {}
     for field in updatable_fields:
         value = getattr(car, field)
         if value is not None:
+            if value != getattr(car_db, field):
+                changes[field] = [getattr(car_db, field), value]
             setattr(car_db, field, value)
 
     db.add(car_db)
+    mark_features_changed(db)
+    bump_collection_version(db, "cars")
+    record_event(db, "car.updated", car_db.id, car_payload(car_db))
     db.commit()
+    audit_log.record(current_user.id, "car.updated", "car", car_db.id, changes)
     db.refresh(car_db)
 
     return car_db
     
 
 @router.delete("/{car_id}", status_code=204)
-def delete_car(car_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def delete_car(car_id: int, db: Session = Depends(get_car_db), current_user: User = Depends(get_current_user)):
     if current_user.role not in {"ADMIN", "AGENT"}:
         raise HTTPException(status_code=403, detail="Not authorized")
     
@@ -180,7 +399,11 @@ def delete_car(car_id: int, db: Session = Depends(get_db), current_user: User =
         raise HTTPException(status_code=404, detail="Car not found")
 
     car_db.status = "DISABLED"
+    mark_features_changed(db)
+    bump_collection_version(db, "cars")
+    record_event(db, "car.deleted", car_db.id, car_payload(car_db))
     db.commit()
+    audit_log.record(current_user.id, "car.deleted", "car", car_db.id, {"plate": car_db.plate})
 
     return {"detail": "Car deleted successfully"}
 
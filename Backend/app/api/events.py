@@ -0,0 +1,81 @@
+import asyncio
+import json
+import time
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from app.api.auth import get_current_user
+from app.models.user import User
+from app.core.outbox import read_events
+from app.core.sharding import DEFAULT_BRANCH, shard_router
+from app.schemas.event import EventPageSchema
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+POLL_INTERVAL_SECONDS = 0.5
+KEEP_ALIVE_SECONDS = 15
+
+
+def fetch_events(session_factory, after: int, limit: int) -> list[dict]:
+    db = session_factory()
+    try:
+        return read_events(db, after, limit)
+    finally:
+        db.close()
+
+
+def check_consumer(current_user: User) -> None:
+    if current_user.role not in {"ADMIN", "AGENT"}:
+        raise HTTPException(status_code=403, detail="Not allowed")
+
+
+@router.get("/", response_model=EventPageSchema)
+async def list_events(after: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000),
+                      wait: float = Query(0, ge=0, le=30, description="Seconds to long-poll when there are no new events"),
+                      branch: str | None = Header(None, alias="X-Branch"),
+                      current_user: User = Depends(get_current_user)):
+    check_consumer(current_user)
+    # Event ids are per branch database, so a consumer follows one branch per cursor.
+    session_factory = shard_router.by_name(branch or DEFAULT_BRANCH).session_factory
+
+    deadline = time.monotonic() + wait
+    while True:
+        events = await run_in_threadpool(fetch_events, session_factory, after, limit)
+        if events or time.monotonic() >= deadline:
+            break
+        await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+    return {"events": events, "next_cursor": events[-1]["id"] if events else after}
+
+
+@router.get("/stream")
+async def stream_events(request: Request, after: int = Query(0, ge=0),
+                        last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+                        branch: str | None = Header(None, alias="X-Branch"),
+                        current_user: User = Depends(get_current_user)):
+    check_consumer(current_user)
+    session_factory = shard_router.by_name(branch or DEFAULT_BRANCH).session_factory
+    # EventSource sends Last-Event-ID when it reconnects; it wins over ?after=.
+    cursor = int(last_event_id) if last_event_id and last_event_id.isdigit() else after
+
+    async def generate():
+        nonlocal cursor
+        idle = 0.0
+        while not await request.is_disconnected():
+            events = await run_in_threadpool(fetch_events, session_factory, cursor, 500)
+            for event in events:
+                data = json.dumps(jsonable_encoder(event))
+                yield f"id: {event['id']}\nevent: {event['event_type']}\ndata: {data}\n\n"
+                cursor = event["id"]
+            if events:
+                idle = 0.0
+                continue
+            if idle >= KEEP_ALIVE_SECONDS:
+                yield ": keep-alive\n\n"
+                idle = 0.0
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+            idle += POLL_INTERVAL_SECONDS
+
+    return StreamingResponse(generate(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -0,0 +1,50 @@
+import asyncio
+from fastapi import APIRouter, Request, WebSocket
+from fastapi.responses import StreamingResponse
+from app.core.push import push_hub
+
+router = APIRouter(prefix="/live", tags=["live"])
+
+KEEP_ALIVE_SECONDS = 15
+
+
+@router.websocket("/cars")
+async def cars_socket(websocket: WebSocket):
+    await websocket.accept()
+    subscription = push_hub.subscribe()
+
+    async def send_updates():
+        while True:
+            await websocket.send_text(await subscription.queue.get())
+
+    async def wait_for_disconnect():
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = [asyncio.create_task(send_updates()), asyncio.create_task(wait_for_disconnect())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        push_hub.unsubscribe(subscription)
+
+
+@router.get("/cars/stream")
+async def cars_stream(request: Request):
+    subscription = push_hub.subscribe()
+
+    async def generate():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(subscription.queue.get(), KEEP_ALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {message}\n\n"
+        finally:
+            push_hub.unsubscribe(subscription)
+
+    return StreamingResponse(generate(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
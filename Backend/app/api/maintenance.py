@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.api.auth import get_current_user
+from app.models.user import User
+from app.core.maintenance import refresh_maintenance
+from app.core.sharding import get_car_db, shard_router
+from app.models.car import Car, CarServiceHistory
+from app.models.maintenance import CarMaintenance
+from app.schemas.maintenance import MaintenanceSchema, ServiceRecordCreateSchema
+
+router = APIRouter(prefix="/maintenance", tags=["maintenance"])
+
+
+def check_staff(current_user: User) -> None:
+    if current_user.role not in {"ADMIN", "AGENT"}:
+        raise HTTPException(status_code=403, detail="Not allowed")
+
+
+def maintenance_row(m: CarMaintenance, plate: str, mileage: int) -> dict:
+    return {"car_id": m.car_id, "plate": plate, "mileage": mileage, "last_service_date": m.last_service_date,
+            "last_service_mileage": m.last_service_mileage, "due_mileage": m.due_mileage, "due_date": m.due_date,
+            "is_due": m.is_due}
+
+
+@router.get("/due", response_model=List[MaintenanceSchema])
+def list_due(within_km: int = Query(0, ge=0), within_days: int = Query(0, ge=0),
+             current_user: User = Depends(get_current_user)):
+    check_staff(current_user)
+
+    horizon = datetime.now(timezone.utc) + timedelta(days=within_days)
+    pages = shard_router.fan_out(lambda db: [
+        maintenance_row(m, plate, mileage)
+        for m, plate, mileage in (
+            db.query(CarMaintenance, Car.plate, Car.mileage)
+            .join(Car, Car.id == CarMaintenance.car_id)
+            .filter(or_(
+                CarMaintenance.is_due,
+                CarMaintenance.due_mileage - Car.mileage <= within_km,
+                CarMaintenance.due_date <= horizon,
+            ))
+        )
+    ])
+    rows = [row for page in pages for row in page]
+    # Same order as the per-branch query used to give: due first, then by due date (unknown dates first).
+    rows.sort(key=lambda row: (not row["is_due"], row["due_date"] is not None, row["due_date"] or datetime.min, row["car_id"]))
+    return rows
+
+
+@router.post("/{car_id}/service", response_model=MaintenanceSchema, status_code=201)
+def record_service(car_id: int, service: ServiceRecordCreateSchema, db: Session = Depends(get_car_db),
+                   current_user: User = Depends(get_current_user)):
+    check_staff(current_user)
+    car = db.query(Car).filter(Car.id == car_id).first()
+    if not car:
+        raise HTTPException(status_code=404, detail="Car not found")
+
+    record = CarServiceHistory(car_id=car_id, description=service.description, mileage=service.mileage)
+    if service.service_date is not None:
+        record.service_date = service.service_date
+    if service.mileage > (car.mileage or 0):
+        car.mileage = service.mileage
+    db.add(record)
+    db.flush()
+    # Recompute this car right away so it is bookable again without waiting for the job.
+    refresh_maintenance(db, car_ids=[car_id])
+    return maintenance_row(db.get(CarMaintenance, car_id), car.plate, car.mileage)
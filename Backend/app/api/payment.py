@@ -1,9 +1,15 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from app.api.auth import get_current_user
 from app.models.user import User
-from app.core.database import get_db
+from app.core.audit import audit_log
+from app.core.http_cache import make_etag, is_not_modified, not_modified, set_cache_headers
+from app.core.idempotency import idempotency_store, request_fingerprint
+from app.core.outbox import record_event, payment_payload
+from app.core.rollups import record_payment_paid
+from app.core.sharding import get_payment_db, shard_router
+from app.core.user_summary import update_user_summary
 from app.models.rental import Rental, Payment
 from app.schemas.rental import PaymentCreateSchema, PaymentResponseSchema
 from datetime import datetime, timezone
@@ -13,7 +19,21 @@ router = APIRouter(prefix = "/payments", tags = ["payments"])
 
 
 @router.post("/{payment_id}/pay", response_model=PaymentResponseSchema)
-def pay_rental(payment_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def pay_rental(payment_id: int, db: Session = Depends(get_payment_db), current_user: User = Depends(get_current_user),
+               idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=100)):
+    fingerprint = request_fingerprint(payment_id)
+    replayed = idempotency_store.reserve(db, current_user.id, "pay_rental", idempotency_key, fingerprint)
+    if replayed is not None:
+        return replayed
+    try:
+        return settle_payment(db, payment_id, current_user, idempotency_key, fingerprint)
+    except BaseException:
+        idempotency_store.release(db, current_user.id, "pay_rental", idempotency_key)
+        raise
+
+
+def settle_payment(db: Session, payment_id: int, current_user: User, idempotency_key: str | None,
+                   fingerprint: str) -> Payment:
     p = db.query(Payment).filter(Payment.id == payment_id).first()
     if p is None:
         raise HTTPException(status_code=404, detail="Payment not found")
@@ -31,26 +51,53 @@ def pay_rental(payment_id: int, db: Session = Depends(get_db), current_user: Use
 
     p.status = "PAID"
     p.paid_at = datetime.now(timezone.utc)
+    if r.car:
+        record_payment_paid(db, p, r.car)
 
-    db.commit()
+    db.flush()
     db.refresh(p)
+    record_event(db, "payment.paid", p.id, payment_payload(p))
+    update_user_summary(db, r.user_id, paid=p.amount)
+    idempotency_store.record(db, current_user.id, "pay_rental", idempotency_key, fingerprint, 200,
+                             PaymentResponseSchema.model_validate(p))
+    db.commit()
+    audit_log.record(current_user.id, "payment.paid", "payment", p.id,
+                     {"rental_id": r.id, "user_id": r.user_id, "amount": str(p.amount)})
     return p
 
 
+@router.get("/me", response_model=List[PaymentResponseSchema])
+def get_my_payments(current_user: User = Depends(get_current_user),
+                    page: int = Query(1, ge=1), limit: int = Query(20, ge=1, le=100)):
+    offset = (page - 1) * limit
+    pages = shard_router.fan_out(lambda db: (
+        db.query(Payment)
+        .join(Rental)
+        .filter(Rental.user_id == current_user.id)
+        .order_by(Payment.id.desc())
+        .limit(offset + limit)
+        .all()
+    ))
+    payments = sorted((p for branch_payments in pages for p in branch_payments), key=lambda p: p.id, reverse=True)
+    return payments[offset:offset + limit]
+
+
 @router.get("/{payment_id}", response_model=PaymentResponseSchema)
-def get_payment(payment_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    p = db.query(Payment).filter(Payment.id == payment_id).first()
-    if p is None:
+def get_payment(payment_id: int, request: Request, response: Response, db: Session = Depends(get_payment_db), current_user: User = Depends(get_current_user)):
+    p_meta = db.query(Payment.rental_id, Payment.version, Payment.updated_at).filter(Payment.id == payment_id).first()
+    if p_meta is None:
         raise HTTPException(status_code=404, detail="Payment not found")
-    r = db.query(Rental).filter(Rental.id == p.rental_id).first()
-    if r is None:
+    r_user_id = db.query(Rental.user_id).filter(Rental.id == p_meta.rental_id).scalar()
+    if r_user_id is None:
         raise HTTPException(status_code=404, detail="Rental not found")
-    if r.user_id != current_user.id and current_user.role != "ADMIN":
+    if r_user_id != current_user.id and current_user.role != "ADMIN":
         raise HTTPException(status_code=403, detail="Not authorized to view this payment")
-    return p
 
+    etag = make_etag("payment", payment_id, p_meta.version)
+    if is_not_modified(request, etag, p_meta.updated_at):
+        return not_modified(etag, p_meta.updated_at, private=True)
+
+    p = db.query(Payment).filter(Payment.id == payment_id).first()
+    set_cache_headers(response, etag, p_meta.updated_at, private=True)
+    return p
 
-@router.get("/me", response_model=List[PaymentResponseSchema])
-def get_my_payments(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    payments = db.query(Payment).join(Rental).filter(Rental.user_id == current_user.id).all()
-    return payments
@@ -0,0 +1,28 @@
+from typing import List
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.core.reference_data import reference_data
+from app.schemas.car import CarTypeResponseSchema, FuelTypeResponseSchema, GearboxTypeResponseSchema, TagResponseSchema
+
+router = APIRouter(prefix="/reference", tags=["reference"])
+
+
+@router.get("/car-types", response_model=List[CarTypeResponseSchema])
+def list_car_types(db: Session = Depends(get_db)):
+    return reference_data.items(db, "car_types")
+
+
+@router.get("/fuel-types", response_model=List[FuelTypeResponseSchema])
+def list_fuel_types(db: Session = Depends(get_db)):
+    return reference_data.items(db, "fuel_types")
+
+
+@router.get("/gearbox-types", response_model=List[GearboxTypeResponseSchema])
+def list_gearbox_types(db: Session = Depends(get_db)):
+    return reference_data.items(db, "gearbox_types")
+
+
+@router.get("/tags", response_model=List[TagResponseSchema])
+def list_tags(db: Session = Depends(get_db)):
+    return reference_data.items(db, "tags")
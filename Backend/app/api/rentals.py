@@ -1,20 +1,47 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.core.database import get_db
+from app.core.audit import audit_log
+from app.core.http_cache import bump_collection_version, make_etag, is_not_modified, not_modified, set_cache_headers
+from app.core.idempotency import idempotency_store, request_fingerprint
+from app.core.maintenance import booking_blocked
+from app.core.outbox import record_event, car_payload, rental_payload, payment_payload
+from app.core.rollups import record_rental_finished
+from app.core.sharding import get_rental_db, shard_router, shard_session_for_id
+from app.core.user_summary import get_user_summary, merge_summaries, update_user_summary
 from app.models.rental import Rental, Payment
 from app.models.car import Car
-from app.schemas.rental import RentalCreateSchema, RentalResponseSchema
+from app.schemas.rental import RentalCreateSchema, RentalResponseSchema, UserRentalSummarySchema
 from datetime import datetime, timezone
 from decimal import Decimal
 from math import ceil
 
 router = APIRouter(prefix="/rentals", tags=["rentals"])
 
+def get_booking_db(rental: RentalCreateSchema, db: Session = Depends(get_db)):
+    # A booking is written to its car's branch database.
+    yield from shard_session_for_id(rental.car_id, db, "Car not found")
+
+
 @router.post("/", response_model=RentalResponseSchema, status_code=201)
-def create_rental(rental: RentalCreateSchema, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def create_rental(rental: RentalCreateSchema, db: Session = Depends(get_booking_db), current_user: User = Depends(get_current_user),
+                  idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=100)):
+    fingerprint = request_fingerprint(rental)
+    replayed = idempotency_store.reserve(db, current_user.id, "create_rental", idempotency_key, fingerprint)
+    if replayed is not None:
+        return replayed
+    try:
+        return book_rental(db, rental, current_user, idempotency_key, fingerprint)
+    except BaseException:
+        idempotency_store.release(db, current_user.id, "create_rental", idempotency_key)
+        raise
+
+
+def book_rental(db: Session, rental: RentalCreateSchema, current_user: User, idempotency_key: str | None,
+                fingerprint: str) -> Rental:
     rental_db = Rental(
         car_id=rental.car_id,
         user_id=current_user.id,
@@ -35,6 +62,9 @@ def create_rental(rental: RentalCreateSchema, db: Session = Depends(get_db), cur
     if car.status != "AVAILABLE":
         raise HTTPException(status_code=400, detail="Car is not available for rental")
 
+    if booking_blocked(db, car.id, rental.end_date):
+        raise HTTPException(status_code=400, detail="Car is due for maintenance in this period")
+
     overlap = db.query(Rental).filter(
         Rental.car_id == rental.car_id,
         Rental.status != "CANCELLED",
@@ -52,14 +82,18 @@ def create_rental(rental: RentalCreateSchema, db: Session = Depends(get_db), cur
     rental_db.status = "NOT_STARTED"
 
     db.add(rental_db)
-    db.commit()
+    db.flush()
     db.refresh(rental_db)
-
+    record_event(db, "rental.created", rental_db.id, rental_payload(rental_db))
+    update_user_summary(db, rental_db.user_id, rentals=1)
+    idempotency_store.record(db, current_user.id, "create_rental", idempotency_key, fingerprint, 201,
+                             RentalResponseSchema.model_validate(rental_db))
+    db.commit()
     return rental_db
 
 
 @router.post("/{rental_id}/start", response_model=RentalResponseSchema)
-def start_rental(rental_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def start_rental(rental_id: int, db: Session = Depends(get_rental_db), current_user: User = Depends(get_current_user)):
     now = datetime.now(timezone.utc)
     r = db.query(Rental).filter(Rental.id == rental_id).first()
     if r is None:
@@ -75,14 +109,18 @@ def start_rental(rental_id: int, db: Session = Depends(get_db), current_user: Us
     car = db.query(Car).filter(Car.id == r.car_id).first()
     if car:
         car.status = "UNAVAILABLE"
+        bump_collection_version(db, "cars")
+        record_event(db, "car.updated", car.id, car_payload(car))
     r.started_at = now
+    record_event(db, "rental.started", r.id, rental_payload(r))
+    update_user_summary(db, r.user_id)
     db.commit()
     db.refresh(r)
     return r
 
 
 @router.post("/{rental_id}/finish", response_model=RentalResponseSchema)
-def finish_rental(rental_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def finish_rental(rental_id: int, db: Session = Depends(get_rental_db), current_user: User = Depends(get_current_user)):
     now = datetime.now(timezone.utc)
     r = db.query(Rental).filter(Rental.id == rental_id).first()
     if r is None:
@@ -105,7 +143,12 @@ def finish_rental(rental_id: int, db: Session = Depends(get_db), current_user: U
     car = db.query(Car).filter(Car.id == r.car_id).first()
     if car:
         car.status = "AVAILABLE"
+        bump_collection_version(db, "cars")
     r.returned_at = now
+    if car:
+        record_rental_finished(db, r, car)
+        record_event(db, "car.updated", car.id, car_payload(car))
+    record_event(db, "rental.finished", r.id, rental_payload(r))
 
     payment_db = None
 
@@ -118,6 +161,9 @@ def finish_rental(rental_id: int, db: Session = Depends(get_db), current_user: U
             status="NOT_PAID",
         )
         db.add(payment_db)
+        db.flush()
+        record_event(db, "payment.created", payment_db.id, payment_payload(payment_db))
+    update_user_summary(db, r.user_id, finished=1)
 
     db.commit()
     db.refresh(r)
@@ -128,7 +174,7 @@ def finish_rental(rental_id: int, db: Session = Depends(get_db), current_user: U
 
 
 @router.post("/{rental_id}/cancel", response_model=RentalResponseSchema)
-def cancel_rental(rental_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def cancel_rental(rental_id: int, db: Session = Depends(get_rental_db), current_user: User = Depends(get_current_user)):
     r = db.query(Rental).filter(Rental.id == rental_id).first()
     if r is None:
         raise HTTPException(status_code=404, detail="Rental not found")
@@ -143,32 +189,66 @@ def cancel_rental(rental_id: int, db: Session = Depends(get_db), current_user: U
     car = db.query(Car).filter(Car.id == r.car_id).first()
     if car:
         car.status = "AVAILABLE"
+        bump_collection_version(db, "cars")
+        record_event(db, "car.updated", car.id, car_payload(car))
+    record_event(db, "rental.cancelled", r.id, rental_payload(r))
+    update_user_summary(db, r.user_id)
 
     db.commit()
+    if current_user.id != r.user_id:
+        audit_log.record(current_user.id, "rental.cancelled", "rental", r.id, {"user_id": r.user_id, "car_id": r.car_id})
     db.refresh(r)
     return r
 
 
+@router.get("/me", response_model=List[RentalResponseSchema])
+def get_my_rentals(current_user: User = Depends(get_current_user),
+                   page: int = Query(1, ge=1), limit: int = Query(20, ge=1, le=100)):
+    # Each branch returns its first offset + limit rows; the merged page is cut from those.
+    offset = (page - 1) * limit
+    pages = shard_router.fan_out(lambda db: (
+        db.query(Rental)
+        .filter(Rental.user_id == current_user.id)
+        .order_by(Rental.start_date.desc())
+        .limit(offset + limit)
+        .all()
+    ))
+    rentals_db = sorted((r for branch_rentals in pages for r in branch_rentals), key=lambda r: r.start_date, reverse=True)
+    return rentals_db[offset:offset + limit]
+
+
+@router.get("/me/summary", response_model=UserRentalSummarySchema)
+def get_my_summary(request: Request, response: Response, current_user: User = Depends(get_current_user)):
+    summaries = shard_router.fan_out(lambda db: get_user_summary(db, current_user.id))
+    updated_at = max(summary.updated_at for summary in summaries)
+    etag = make_etag("rental-summary", current_user.id, *(summary.version for summary in summaries))
+    if is_not_modified(request, etag, updated_at):
+        return not_modified(etag, updated_at, private=True)
+    set_cache_headers(response, etag, updated_at, private=True)
+    return merge_summaries(summaries)
+
+
 @router.get("/{rental_id}", response_model=RentalResponseSchema)
-def get_rental(rental_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    rental_db = db.query(Rental).filter(Rental.id == rental_id).first()
-    if not rental_db:
+def get_rental(rental_id: int, request: Request, response: Response, db: Session = Depends(get_rental_db), current_user: User = Depends(get_current_user)):
+    rental_meta = db.query(Rental.user_id, Rental.version, Rental.updated_at).filter(Rental.id == rental_id).first()
+    if not rental_meta:
         raise HTTPException(status_code=404, detail="Rental not found")
-    if current_user.id != rental_db.user_id and current_user.role != "ADMIN":
+    if current_user.id != rental_meta.user_id and current_user.role != "ADMIN":
         raise HTTPException(status_code=403, detail="Not allowed")
 
-    return rental_db
+    etag = make_etag("rental", rental_id, rental_meta.version)
+    if is_not_modified(request, etag, rental_meta.updated_at):
+        return not_modified(etag, rental_meta.updated_at, private=True)
 
+    rental_db = db.query(Rental).filter(Rental.id == rental_id).first()
+    set_cache_headers(response, etag, rental_meta.updated_at, private=True)
 
-@router.get("/me", response_model=List[RentalResponseSchema])
-def get_my_rentals(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    rentals_db = db.query(Rental).filter(Rental.user_id == current_user.id).all()
-    return rentals_db
+    return rental_db
 
 
 @router.get("/", response_model=List[RentalResponseSchema])
-def get_all_rentals(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def get_all_rentals(current_user: User = Depends(get_current_user)):
     if current_user.role != "ADMIN":
         raise HTTPException(403, "Not allowed")
-    rentals_db = db.query(Rental).all()
+    rentals_db = [r for branch_rentals in shard_router.fan_out(lambda db: db.query(Rental).all()) for r in branch_rentals]
     return rentals_db
\ No newline at end of file
@@ -0,0 +1,54 @@
+import os
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, exists, insert, select
+from sqlalchemy.orm import Session
+from app.models.archive import ArchivedRental, ArchivedPayment
+from app.models.rental import Rental, Payment
+
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "365"))
+ARCHIVED_STATUSES = ("FINISHED", "CANCELLED")
+
+
+def _copied_columns(archive_model) -> list[str]:
+    return [column.name for column in archive_model.__table__.columns if column.name != "archived_at"]
+
+
+RENTAL_COLUMNS = _copied_columns(ArchivedRental)
+PAYMENT_COLUMNS = _copied_columns(ArchivedPayment)
+
+
+def archivable_rental_ids(db: Session, cutoff: datetime, limit: int) -> list[int]:
+    # Unpaid payments are outstanding debt and stay hot however old the rental is.
+    unpaid = exists().where(Payment.rental_id == Rental.id, Payment.status != "PAID")
+    return db.scalars(
+        select(Rental.id)
+        .where(Rental.status.in_(ARCHIVED_STATUSES), Rental.end_date < cutoff, ~unpaid)
+        .order_by(Rental.id)
+        .limit(limit)
+    ).all()
+
+
+def archive_rentals(db: Session, rental_ids: list[int]) -> None:
+    """Move the given rentals and their payments to the archive tables in one transaction."""
+    rentals, payments = Rental.__table__, Payment.__table__
+    db.execute(insert(ArchivedRental).from_select(
+        RENTAL_COLUMNS, select(*(rentals.c[name] for name in RENTAL_COLUMNS)).where(rentals.c.id.in_(rental_ids))))
+    db.execute(insert(ArchivedPayment).from_select(
+        PAYMENT_COLUMNS, select(*(payments.c[name] for name in PAYMENT_COLUMNS)).where(payments.c.rental_id.in_(rental_ids))))
+    db.execute(delete(payments).where(payments.c.rental_id.in_(rental_ids)))
+    db.execute(delete(rentals).where(rentals.c.id.in_(rental_ids)))
+    db.commit()
+
+
+def archive_history(db: Session, older_than_days: int = ARCHIVE_AFTER_DAYS, batch_size: int = 1000) -> int:
+    """Archive closed rentals that ended more than ``older_than_days`` ago. Returns how many moved.
+
+    Each batch commits on its own, so the job holds the write lock only briefly and can be
+    stopped and rerun at any point.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    moved = 0
+    while rental_ids := archivable_rental_ids(db, cutoff, batch_size):
+        archive_rentals(db, rental_ids)
+        moved += len(rental_ids)
+    return moved
@@ -0,0 +1,135 @@
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from decimal import Decimal
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert
+from app.core.database import SessionLocal
+from app.models.audit import AuditEntry
+
+logger = logging.getLogger(__name__)
+
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+AUDIT_FLUSH_SECONDS = float(os.getenv("AUDIT_FLUSH_SECONDS", "1"))
+AUDIT_MAX_BUFFER = int(os.getenv("AUDIT_MAX_BUFFER", "10000"))
+
+
+class AuditLog:
+    """Buffers audit entries in the worker and appends them to ``audit_log`` in batches.
+
+    ``record`` only appends to a list, so audited requests pay no extra write. A background
+    thread inserts the buffer with one multi-row INSERT once it holds ``AUDIT_BATCH_SIZE``
+    entries or every ``AUDIT_FLUSH_SECONDS``, and ``stop`` flushes the rest on shutdown.
+    A worker killed without shutting down loses at most its last flush interval of entries.
+    While the database rejects writes, entries are kept and retried, up to ``AUDIT_MAX_BUFFER``;
+    past that the oldest are dropped and logged.
+    """
+
+    def __init__(self, session_factory=SessionLocal, batch_size: int = AUDIT_BATCH_SIZE,
+                 flush_seconds: float = AUDIT_FLUSH_SECONDS, max_buffer: int = AUDIT_MAX_BUFFER):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_buffer = max_buffer
+        self._buffer: list[dict] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def record(self, actor_id: int, action: str, entity_type: str, entity_id: int, detail: dict | None = None) -> None:
+        """Queue an entry. Call after the audited change committed, so rolled-back changes leave no trail."""
+        entry = {
+            "created_at": datetime.now(timezone.utc),
+            "actor_id": actor_id,
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            # Money stays exact: Decimals are stored as strings, not floats.
+            "detail": json.dumps(jsonable_encoder(detail or {}, custom_encoder={Decimal: str})),
+        }
+        with self._lock:
+            self._buffer.append(entry)
+            overflow = len(self._buffer) - self.max_buffer
+            if overflow > 0:
+                del self._buffer[:overflow]
+            full = len(self._buffer) >= self.batch_size
+        if overflow > 0:
+            logger.error("Audit buffer full; dropped %d oldest entries", overflow)
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if not batch:
+            return 0
+
+        db = None
+        try:
+            db = self.session_factory()
+            db.execute(insert(AuditEntry), batch)
+            db.commit()
+        except Exception:
+            if db is not None:
+                db.rollback()
+            # Put the batch back in front of anything recorded meanwhile and retry on the next flush.
+            with self._lock:
+                self._buffer[:0] = batch
+                overflow = len(self._buffer) - self.max_buffer
+                if overflow > 0:
+                    del self._buffer[:overflow]
+            if overflow > 0:
+                logger.error("Audit buffer full; dropped %d oldest entries", overflow)
+            raise
+        finally:
+            if db is not None:
+                db.close()
+        return len(batch)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-log", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stopping.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Final audit flush failed; %d entries lost", len(self))
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Audit flush failed; retrying")
+
+
+def entry_to_dict(entry: AuditEntry) -> dict:
+    return {
+        "id": entry.id,
+        "created_at": entry.created_at,
+        "actor_id": entry.actor_id,
+        "action": entry.action,
+        "entity_type": entry.entity_type,
+        "entity_id": entry.entity_id,
+        "detail": json.loads(entry.detail),
+    }
+
+
+audit_log = AuditLog()
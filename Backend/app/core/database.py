@@ -1,7 +1,28 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+import os
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
-engine = create_engine("sqlite+pysqlite:///C:/Users/HomePC/Desktop/FreeTimeCodes/Rental-Car-Project/Rental-Cars/Backend/app/db/database.db", echo=True)
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+pysqlite:///C:/Users/HomePC/Desktop/FreeTimeCodes/Rental-Car-Project/Rental-Cars/Backend/app/db/database.db")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    # Several worker processes share the file: WAL lets readers run alongside the writer,
+    # and busy_timeout makes writers wait for the lock instead of failing immediately.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
+def make_engine(url: str):
+    new_engine = create_engine(url, echo=os.getenv("SQL_ECHO", "1") == "1", pool_size=DB_POOL_SIZE, pool_pre_ping=True)
+    if new_engine.dialect.name == "sqlite":
+        event.listen(new_engine, "connect", set_sqlite_pragmas)
+    return new_engine
+
+
+engine = make_engine(DATABASE_URL)
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
 
@@ -15,6 +36,23 @@ def get_db():
     finally:
         db.close()
 
+
+def dialect_insert(db: Session, model):
+    """INSERT for ``db``'s dialect, so callers can add ON CONFLICT clauses on SQLite and PostgreSQL alike."""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
 from app.models.user import User
 from app.models.car import Car
-from app.models.rental import Rental
\ No newline at end of file
+from app.models.rental import Rental
+from app.models.version import CollectionVersion
+from app.models.idempotency import IdempotencyRecord
+from app.models.analytics import CarDailyStats, CarTypeDailyStats
+from app.models.outbox import OutboxEvent
+from app.models.archive import ArchivedRental, ArchivedPayment
+from app.models.user_summary import UserRentalSummary
+from app.models.maintenance import CarMaintenance
+from app.models.audit import AuditEntry
@@ -0,0 +1,266 @@
+import random
+from operator import itemgetter
+from datetime import datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, Iterator, Sequence
+from sqlalchemy import DateTime, Numeric, func, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from app.core.database import Base
+from app.core.http_cache import bump_collection_version
+from app.core.reference_data import REFERENCE_VERSION_KEY
+from app.core.similarity import FEATURES_VERSION_KEY
+from app.models.car import Car, CarTags, CarType, FuelType, GearboxType, Tag
+from app.models.rental import Rental, Payment
+from app.models.user import User
+
+BATCH_SIZE = 20_000
+HISTORY_DAYS = 365
+BOOKING_HORIZON_DAYS = 60
+
+CAR_TYPES = ("Sedan", "Hatchback", "SUV", "Estate", "Coupe", "Convertible", "Van", "Pickup")
+FUEL_TYPES = ("Petrol", "Diesel", "Hybrid", "Electric")
+GEARBOX_TYPES = ("Manual", "Automatic")
+TAGS = ("Air conditioning", "GPS", "Bluetooth", "Child seat", "Roof rack", "Heated seats", "Parking sensors",
+        "Rear camera", "Cruise control", "Tow bar", "Apple CarPlay", "Winter tyres")
+MODELS = {
+    "Volkswagen": ("Golf", "Passat", "Polo", "Tiguan", "Touran"),
+    "Skoda": ("Octavia", "Fabia", "Superb", "Kodiaq"),
+    "Toyota": ("Corolla", "Yaris", "RAV4", "C-HR"),
+    "BMW": ("320d", "X1", "X3", "118i"),
+    "Audi": ("A3", "A4", "Q3", "Q5"),
+    "Ford": ("Focus", "Fiesta", "Kuga", "Transit"),
+    "Renault": ("Clio", "Megane", "Captur", "Trafic"),
+    "Tesla": ("Model 3", "Model Y"),
+}
+COLORS = ("black", "white", "silver", "grey", "blue", "red", "green")
+FIRST_NAMES = ("Anna", "Ben", "Clara", "David", "Eva", "Felix", "Greta", "Hugo", "Ida", "Jonas", "Lena", "Max")
+LAST_NAMES = ("Novak", "Schmidt", "Horvat", "Kovac", "Meyer", "Fischer", "Weber", "Jovanovic", "Wagner", "Becker")
+PAYMENT_METHODS = ("CARD", "CARD", "CARD", "CASH", "BANK_TRANSFER")
+# bcrypt hash of "password", fixed so generated users are identical between runs and hashing costs nothing.
+PASSWORD_HASH = "$2b$12$oTwj9eS7juNZpqGg1diEbeD/rm9SfidEaQBj39.c2013AEUcHF/qu"
+
+
+def ensure_reference_data(connection: Connection) -> dict[str, list[int]]:
+    """Insert the lookup rows that are missing by name and return the ids of each kind."""
+    ids = {}
+    for kind, model, names in (("car_types", CarType, CAR_TYPES), ("fuel_types", FuelType, FUEL_TYPES),
+                               ("gearbox_types", GearboxType, GEARBOX_TYPES), ("tags", Tag, TAGS)):
+        existing = set(connection.scalars(select(model.name)))
+        missing = [{"name": name} for name in names if name not in existing]
+        if missing:
+            connection.execute(model.__table__.insert(), missing)
+        ids[kind] = list(connection.scalars(select(model.id).where(model.name.in_(names)).order_by(model.id)))
+    return ids
+
+
+def _driver_value(column, dialect_name: str):
+    # What SQLAlchemy's SQLite bind processors would produce; other drivers take the Python values as they are.
+    if dialect_name != "sqlite":
+        return None
+    if isinstance(column.type, DateTime):
+        # SQLAlchemy's "YYYY-MM-DD HH:MM:SS.ffffff", without the UTC offset. Generated times fall
+        # on whole hours and repeat a lot, so each is rendered once.
+        rendered = {None: None}
+
+        def render(value):
+            rendered_value = rendered.get(value, False)
+            if rendered_value is False:
+                rendered_value = rendered[value] = value.isoformat(" ", "microseconds")[:26]
+            return rendered_value
+        return render
+    if isinstance(column.type, Numeric):
+        return lambda value: None if value is None else float(value)
+    return None
+
+
+def bulk_insert(connection: Connection, table, rows: list[dict]) -> None:
+    """Multi-row INSERT sent straight to the driver's executemany.
+
+    Skips SQLAlchemy's per-row parameter processing, which otherwise costs several times
+    the insert itself. All rows must have the keys of the first one.
+    """
+    if not rows:
+        return
+    compiled = table.insert().compile(dialect=connection.dialect, column_keys=list(rows[0]))
+    if not compiled.positional:
+        connection.exec_driver_sql(str(compiled), rows)
+        return
+
+    order = compiled.positiontup
+    values_of = itemgetter(*order)
+    converters = [(i, convert) for i, key in enumerate(order)
+                  if (convert := _driver_value(table.c[key], connection.dialect.name)) is not None]
+    params = []
+    for row in rows:
+        values = list(values_of(row)) if len(order) > 1 else [values_of(row)]
+        for i, convert in converters:
+            values[i] = convert(values[i])
+        params.append(tuple(values))
+    connection.exec_driver_sql(str(compiled), params)
+
+
+def next_id(connection: Connection, model, floor: int = 0) -> int:
+    return max(connection.scalar(select(func.max(model.id))) or 0, floor) + 1
+
+
+def sync_sequences(connection: Connection, models) -> None:
+    # Rows are inserted with explicit ids; move PostgreSQL's sequences past them. SQLite keeps up on its own.
+    if connection.dialect.name != "postgresql":
+        return
+    for model in models:
+        table = model.__tablename__
+        connection.execute(text(f"SELECT setval(pg_get_serial_sequence(:table, 'id'), (SELECT MAX(id) FROM {table}))"),
+                           {"table": table})
+
+
+def user_rows(rng: random.Random, first_id: int, count: int, hashed_password: str, now: datetime) -> Iterator[dict]:
+    for user_id in range(first_id, first_id + count):
+        # The first generated user is an admin and every 500th an agent, so staff endpoints have callers.
+        role = "ADMIN" if user_id == first_id else "AGENT" if user_id % 500 == 0 else "USER"
+        yield {"id": user_id, "first_name": rng.choice(FIRST_NAMES), "last_name": rng.choice(LAST_NAMES),
+               "email": f"user{user_id}@example.com", "phone_number": f"+1{user_id:012d}",
+               "hashed_password": hashed_password, "role": role, "is_active": True,
+               "created_at": now - timedelta(hours=rng.randint(0, 3 * 365 * 24))}
+
+
+def rental_rows(rng: random.Random, car: dict, user_ids: Sequence[int], first_id: int, count: int,
+                now: datetime) -> list[dict]:
+    """Up to ``count`` back-to-back bookings of one car, from a year ago into the booking horizon, never overlapping."""
+    rentals = []
+    cursor = now - timedelta(days=HISTORY_DAYS, hours=rng.randint(0, 24 * 30))
+    horizon = now + timedelta(days=BOOKING_HORIZON_DAYS)
+    # Gaps average out so the bookings spread over the whole window; a booking lasts about 100 hours.
+    mean_gap = max((HISTORY_DAYS + BOOKING_HORIZON_DAYS) * 24 // count - 100, 0)
+    for rental_id in range(first_id, first_id + count):
+        start = cursor + timedelta(hours=rng.randint(0, 2 * mean_gap))
+        days = rng.choices((1, 2, 3, 5, 7, 14), weights=(20, 25, 20, 15, 15, 5))[0]
+        end = start + timedelta(days=days)
+        if start > horizon:
+            break
+        cursor = end
+
+        if end <= now:
+            status = "CANCELLED" if rng.random() < 0.05 else "FINISHED"
+        elif start <= now:
+            status = "ACTIVE"
+        else:
+            status = "CANCELLED" if rng.random() < 0.05 else "NOT_STARTED"
+        finished = status == "FINISHED"
+        rentals.append({
+            "id": rental_id, "user_id": rng.choice(user_ids), "car_id": car["id"], "start_date": start, "end_date": end,
+            "created_at": min(start - timedelta(days=rng.randint(1, 30)), now),
+            "started_at": start if status in ("ACTIVE", "FINISHED") else None,
+            "returned_at": end if finished else None,
+            "price_for_day": car["price_per_day"], "price_sum": car["price_per_day"] * days, "status": status,
+            "version": 1, "updated_at": end if finished else start,
+        })
+    return rentals
+
+
+def generate_dataset(engine: Engine, users: int = 1_000, cars: int = 1_000, rentals_per_car: int = 20, seed: int = 42,
+                     today: datetime | None = None, users_engine: Engine | None = None, id_floor: int = 0,
+                     batch_size: int = BATCH_SIZE, progress: Callable[[dict[str, int]], None] | None = None) -> dict[str, int]:
+    """Append a reproducible, internally consistent dataset and return the row counts per table.
+
+    Missing tables are created first, so a fresh engine is enough. The same seed and
+    ``today`` always produce the same rows. Users and lookup rows go to
+    ``users_engine`` (default: ``engine``); cars, tags, rentals and payments go to ``engine``
+    with ids above ``id_floor`` (a branch's ``Shard.first_id``). Rentals of a car never overlap,
+    cars with a rental in progress are UNAVAILABLE, and every finished rental has a payment.
+    With ``users=0`` bookings are spread over the users already in the database.
+    Rows are written with ``bulk_insert`` in batches of ``batch_size``, one transaction per batch.
+    """
+    users_engine = users_engine or engine
+    for bind in {users_engine, engine}:
+        Base.metadata.create_all(bind)
+    rng = random.Random(seed)
+    now = today or datetime.combine(datetime.now(timezone.utc).date(), time(), tzinfo=timezone.utc)
+    counts = {"users": 0, "cars": 0, "car_tags": 0, "rentals": 0, "payments": 0}
+
+    with users_engine.begin() as connection:
+        reference = ensure_reference_data(connection)
+        first_user_id = next_id(connection, User)
+        if users:
+            rows = user_rows(rng, first_user_id, users, PASSWORD_HASH, now)
+            while batch := [row for _, row in zip(range(batch_size), rows)]:
+                bulk_insert(connection, User.__table__, batch)
+                counts["users"] += len(batch)
+            sync_sequences(connection, (User,))
+            user_ids = range(first_user_id, first_user_id + users)
+        else:
+            # Existing ids can have gaps, so bookings pick from the ids actually there.
+            user_ids = tuple(connection.scalars(select(User.id).order_by(User.id)))
+            if not user_ids and cars and rentals_per_car:
+                raise ValueError("No users to book with; generate some with users > 0")
+    if progress:
+        progress(counts)
+
+    with engine.connect() as connection:
+        first_car_id = next_id(connection, Car, id_floor)
+        rental_id = next_id(connection, Rental, id_floor)
+        payment_id = next_id(connection, Payment, id_floor)
+
+    pending = {"cars": [], "car_tags": [], "rentals": [], "payments": []}
+    tables = {"cars": Car.__table__, "car_tags": CarTags.__table__, "rentals": Rental.__table__,
+              "payments": Payment.__table__}
+
+    def flush() -> None:
+        # Parents before children, so foreign keys hold at every statement.
+        with engine.begin() as connection:
+            for name, table in tables.items():
+                bulk_insert(connection, table, pending[name])
+                counts[name] += len(pending[name])
+                pending[name] = []
+        if progress:
+            progress(counts)
+
+    brands = sorted(MODELS)
+    for car_id in range(first_car_id, first_car_id + cars):
+        brand = rng.choice(brands)
+        car = {
+            "id": car_id, "brand": brand, "model": rng.choice(MODELS[brand]), "status": "AVAILABLE",
+            "condition": rng.choices(("excellent", "good", "fair"), weights=(30, 60, 10))[0],
+            "type_id": rng.choice(reference["car_types"]), "plate": f"GN{car_id % 10**8:08d}",
+            "seats": rng.choice((2, 4, 5, 5, 5, 7, 9)), "doors": rng.choice((3, 5, 5)), "color": rng.choice(COLORS),
+            "fuel_id": rng.choice(reference["fuel_types"]), "fuel_per_km": round(rng.uniform(0.04, 0.12), 3),
+            "gearbox_id": rng.choice(reference["gearbox_types"]), "mileage": rng.randint(0, 250_000),
+            "price_per_day": Decimal(rng.randint(25, 250)), "year": rng.randint(2012, now.year), "version": 1,
+            "updated_at": now,
+        }
+        rentals = rental_rows(rng, car, user_ids, rental_id, rentals_per_car, now) if rentals_per_car else []
+        rental_id += len(rentals)
+        if any(rental["status"] == "ACTIVE" for rental in rentals):
+            car["status"] = "UNAVAILABLE"
+        pending["cars"].append(car)
+        pending["car_tags"] += [{"car_id": car_id, "tag_id": tag_id}
+                                for tag_id in rng.sample(reference["tags"], rng.randint(0, 4))]
+        pending["rentals"] += rentals
+
+        for rental in rentals:
+            if rental["status"] != "FINISHED":
+                continue
+            paid = rng.random() < 0.92
+            pending["payments"].append({
+                "id": payment_id, "rental_id": rental["id"], "amount": rental["price_sum"],
+                "payment_method": rng.choice(PAYMENT_METHODS) if paid else "NOT_SPECIFIED",
+                "status": "PAID" if paid else "NOT_PAID",
+                "paid_at": rental["end_date"] + timedelta(hours=rng.randint(0, 72)) if paid else None,
+                "version": 1, "updated_at": rental["end_date"],
+            })
+            payment_id += 1
+
+        if sum(len(rows) for rows in pending.values()) >= batch_size:
+            flush()
+    flush()
+
+    with engine.begin() as connection:
+        sync_sequences(connection, (Car, Rental, Payment))
+
+    # Let per-worker caches (reference data, fleet features, catalog ETags) see the new rows.
+    for bind in {users_engine, engine}:
+        with Session(bind) as db:
+            for key in ("cars", REFERENCE_VERSION_KEY, FEATURES_VERSION_KEY):
+                bump_collection_version(db, key)
+            db.commit()
+    return counts
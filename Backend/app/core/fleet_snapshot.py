@@ -0,0 +1,231 @@
+import os
+import threading
+import time
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass
+from sqlalchemy.orm import Session
+from app.models.car import Car, CarTags
+from app.models.maintenance import CarMaintenance
+from app.models.outbox import OutboxEvent
+
+FLEET_SNAPSHOT = os.getenv("FLEET_SNAPSHOT", "0") == "1"
+FLEET_SNAPSHOT_RELOAD_SECONDS = float(os.getenv("FLEET_SNAPSHOT_RELOAD_SECONDS", "300"))
+
+SNAPSHOT_FIELDS = ("id", "type_id", "fuel_id", "gearbox_id", "price_per_day", "year", "mileage",
+                   "brand", "fuel_per_km", "seats", "doors")
+
+
+@dataclass
+class FleetQuery:
+    """``list_cars`` filters with reference names already resolved to ids."""
+    type_id: int | None = None
+    fuel_id: int | None = None
+    gearbox_id: int | None = None
+    price_from: float | None = None
+    price_to: float | None = None
+    seats: int | None = None
+    tag_ids: tuple[int, ...] = ()
+
+
+class FleetColumns:
+    def __init__(self):
+        self.ids = array("q")
+        self.available = bytearray()
+        self.type_id = array("q")
+        self.fuel_id = array("q")
+        self.gearbox_id = array("q")
+        self.price_per_day = array("d")
+        self.year = array("q")
+        self.mileage = array("q")
+        self.fuel_per_km = array("d")
+        self.seats = array("q")
+        self.doors = array("q")
+        self.brand: list[str] = []
+        self.tag_mask: list[int] = []
+        self.row_by_id: dict[int, int] = {}
+
+    def put(self, car, tag_mask: int) -> None:
+        columns = (self.available, self.type_id, self.fuel_id, self.gearbox_id, self.price_per_day, self.year,
+                   self.mileage, self.fuel_per_km, self.seats, self.doors, self.brand, self.tag_mask)
+        values = (car.available, car.type_id or 0, car.fuel_id or 0, car.gearbox_id or 0,
+                  float(car.price_per_day or 0), car.year or 0, car.mileage or 0, float(car.fuel_per_km or 0),
+                  car.seats or 0, car.doors or 0, car.brand or "", tag_mask)
+        row = self.row_by_id.get(car.id)
+        if row is None:
+            # Every other column is appended before the id, so concurrent readers never see a half-added row.
+            for column, value in zip(columns, values):
+                column.append(value)
+            self.row_by_id[car.id] = len(self.ids)
+            self.ids.append(car.id)
+        else:
+            for column, value in zip(columns, values):
+                column[row] = value
+
+
+class FleetSnapshot:
+    """Per-worker column store of the catalog fields ``list_cars`` filters and sorts on.
+
+    A query starts from the smallest per-value index of its equality filters (type, fuel,
+    gearbox, seats, tags), filters the rest column by column and returns only the page's
+    ids, which the caller hydrates from the database. Small result sets are sorted
+    directly; large ones walk a presorted order of the first sort key and only sort the
+    rows that can reach the page. Indexes and presorted orders are built on first use and
+    dropped with the state they were built from.
+
+    ``refresh`` takes the ``cars`` collection version the request already read for its
+    ETag. When it moved, the cars named in outbox events since the last refresh are
+    re-read in place and the maintenance due set is reloaded. A full reload into fresh
+    columns every ``FLEET_SNAPSHOT_RELOAD_SECONDS`` bounds drift from anything the
+    events miss.
+    """
+
+    def __init__(self, enabled: bool = FLEET_SNAPSHOT, reload_seconds: float = FLEET_SNAPSHOT_RELOAD_SECONDS):
+        self.enabled = enabled
+        self.reload_seconds = reload_seconds
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._cursor = 0
+        self._loaded_at = 0.0
+        # Columns, the bookable rows computed from them and the lazily built indexes and
+        # presorted orders over those rows are swapped together.
+        self._state: tuple[FleetColumns, list[int], dict] = (FleetColumns(), [], {})
+
+    def _is_current(self, version: int) -> bool:
+        return version == self._version and time.monotonic() - self._loaded_at < self.reload_seconds
+
+    def refresh(self, db: Session, version: int) -> None:
+        if self._is_current(version):
+            return
+        with self._lock:
+            if self._is_current(version):
+                return
+            if self._version is None or time.monotonic() - self._loaded_at >= self.reload_seconds:
+                # Take the cursor first so writes racing the reload are replayed on the next refresh.
+                self._cursor = db.query(OutboxEvent.id).order_by(OutboxEvent.id.desc()).limit(1).scalar() or 0
+                columns = FleetColumns()
+                read_cars(db, columns, None)
+                self._loaded_at = time.monotonic()
+            else:
+                columns = self._state[0]
+                events = db.query(OutboxEvent.id, OutboxEvent.event_type, OutboxEvent.entity_id) \
+                    .filter(OutboxEvent.id > self._cursor).order_by(OutboxEvent.id).all()
+                if events:
+                    self._cursor = events[-1].id
+                changed = sorted({entity_id for _, event_type, entity_id in events if event_type.startswith("car.")})
+                if changed:
+                    read_cars(db, columns, changed)
+
+            due = {car_id for (car_id,) in db.query(CarMaintenance.car_id).filter(CarMaintenance.is_due)}
+            bookable = [row for row, car_id in enumerate(columns.ids) if columns.available[row] and car_id not in due]
+            self._state = (columns, bookable, {})
+            self._version = version
+
+    def query(self, spec: FleetQuery, order: list[tuple[str, bool]], offset: int, limit: int) -> tuple[int, list[int]]:
+        """Return (total matches, ids for the requested page) for ``spec`` sorted by ``order``."""
+        columns, bookable, cache = self._state
+        indexed = [(name, getattr(spec, name)) for name in ("type_id", "fuel_id", "gearbox_id", "seats")
+                   if getattr(spec, name) is not None]
+        indexed += [("tag", tag_id) for tag_id in spec.tag_ids]
+        candidates = [_index(cache, columns, bookable, name).get(value, ()) for name, value in indexed]
+        rows = min(candidates, key=len) if candidates else bookable
+        filtered = bool(indexed)
+
+        for name in ("type_id", "fuel_id", "gearbox_id", "seats"):
+            value = getattr(spec, name)
+            if value is not None and len(rows):
+                column = getattr(columns, name)
+                rows = [row for row in rows if column[row] == value]
+        prices = columns.price_per_day
+        if spec.price_from is not None:
+            rows = [row for row in rows if prices[row] >= spec.price_from]
+            filtered = True
+        if spec.price_to is not None:
+            rows = [row for row in rows if prices[row] <= spec.price_to]
+            filtered = True
+        if spec.tag_ids:
+            mask = 0
+            for tag_id in spec.tag_ids:
+                mask |= 1 << tag_id
+            masks = columns.tag_mask
+            rows = [row for row in rows if masks[row] & mask == mask]
+
+        total = len(rows)
+        wanted = offset + limit
+        if not order or offset >= total:
+            return total, [columns.ids[row] for row in rows[offset:wanted]]
+        if total * 8 < len(bookable):
+            rows = _sorted(list(rows), columns, order)
+            return total, [columns.ids[row] for row in rows[offset:wanted]]
+
+        # Walk the first key's presorted order up to the page, plus every row tied with the
+        # last one taken, so the remaining keys only have to order that prefix.
+        name, descending = order[0]
+        key = getattr(columns, name)
+        member = None
+        if filtered:
+            member = bytearray(len(columns.ids))
+            for row in rows:
+                member[row] = 1
+        prefix = []
+        for row in _presorted(cache, columns, bookable, name, descending):
+            if member is not None and not member[row]:
+                continue
+            if len(prefix) >= wanted and key[row] != key[prefix[-1]]:
+                break
+            prefix.append(row)
+        if len(order) > 1:
+            prefix = _sorted(sorted(prefix), columns, order)
+        return total, [columns.ids[row] for row in prefix[offset:wanted]]
+
+
+def _sorted(rows: list[int], columns: FleetColumns, order: list[tuple[str, bool]]) -> list[int]:
+    # The sort is stable, so sorting by the last key first yields the multi-key order.
+    for name, descending in reversed(order):
+        rows.sort(key=getattr(columns, name).__getitem__, reverse=descending)
+    return rows
+
+
+def _index(cache: dict, columns: FleetColumns, bookable: list[int], name: str) -> dict:
+    index = cache.get(("index", name))
+    if index is None:
+        index = defaultdict(list)
+        if name == "tag":
+            masks = columns.tag_mask
+            for row in bookable:
+                mask = masks[row]
+                while mask:
+                    bit = mask & -mask
+                    index[bit.bit_length() - 1].append(row)
+                    mask ^= bit
+        else:
+            column = getattr(columns, name)
+            for row in bookable:
+                index[column[row]].append(row)
+        index = cache[("index", name)] = dict(index)
+    return index
+
+
+def _presorted(cache: dict, columns: FleetColumns, bookable: list[int], name: str, descending: bool) -> list[int]:
+    rows = cache.get(("order", name, descending))
+    if rows is None:
+        rows = cache[("order", name, descending)] = sorted(
+            bookable, key=getattr(columns, name).__getitem__, reverse=descending)
+    return rows
+
+
+def read_cars(db: Session, columns: FleetColumns, car_ids: list[int] | None) -> None:
+    tags = db.query(CarTags.car_id, CarTags.tag_id)
+    # Compared in SQL: deleted cars carry a status outside the column's enum.
+    cars = db.query(*(getattr(Car, name) for name in SNAPSHOT_FIELDS), (Car.status == "AVAILABLE").label("available"))
+    if car_ids is not None:
+        tags = tags.filter(CarTags.car_id.in_(car_ids))
+        cars = cars.filter(Car.id.in_(car_ids))
+    masks = defaultdict(int)
+    for car_id, tag_id in tags.yield_per(50_000):
+        masks[car_id] |= 1 << tag_id
+    for car in cars.order_by(Car.id).yield_per(50_000):
+        columns.put(car, masks.get(car.id, 0))
+
+
+fleet_snapshot = FleetSnapshot()
@@ -0,0 +1,75 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.models.version import CollectionVersion
+
+
+def bump_collection_version(db: Session, name: str) -> None:
+    # Runs inside the caller's transaction, so the bump is committed together with the change.
+    result = db.execute(
+        update(CollectionVersion)
+        .where(CollectionVersion.name == name)
+        .values(version=CollectionVersion.version + 1, updated_at=datetime.now(timezone.utc))
+    )
+    if result.rowcount == 0:
+        db.add(CollectionVersion(name=name, version=1, updated_at=datetime.now(timezone.utc)))
+
+
+def get_collection_version(db: Session, name: str) -> tuple[int, datetime | None]:
+    row = db.query(CollectionVersion.version, CollectionVersion.updated_at).filter(CollectionVersion.name == name).first()
+    if row is None:
+        return 0, None
+    return row.version, row.updated_at
+
+
+def make_etag(*parts) -> str:
+    raw = ":".join(str(p) for p in parts)
+    return 'W/"' + hashlib.sha1(raw.encode()).hexdigest()[:20] + '"'
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is None:
+        return None
+    # SQLite hands back naive datetimes; everything stored by the app is UTC.
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None = None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {tag.strip() for tag in if_none_match.split(",")}
+        # Weak comparison: W/"x" and "x" match each other.
+        bare = etag[2:] if etag.startswith("W/") else etag
+        return "*" in candidates or etag in candidates or bare in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    last_modified = _as_utc(last_modified)
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified <= since
+
+    return False
+
+
+def set_cache_headers(response: Response, etag: str, last_modified: datetime | None = None, private: bool = False) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache" if private else "no-cache"
+    last_modified = _as_utc(last_modified)
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+
+def not_modified(etag: str, last_modified: datetime | None = None, private: bool = False) -> Response:
+    response = Response(status_code=304)
+    set_cache_headers(response, etag, last_modified, private)
+    return response
@@ -0,0 +1,198 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.idempotency import IdempotencyRecord
+
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 60 * 60)))
+IDEMPOTENCY_MEMORY_ENTRIES = int(os.getenv("IDEMPOTENCY_MEMORY_ENTRIES", "10000"))
+# A claim whose request died is given up after this long; a retry waits at most IDEMPOTENCY_WAIT_SECONDS.
+IDEMPOTENCY_PENDING_SECONDS = float(os.getenv("IDEMPOTENCY_PENDING_SECONDS", "60"))
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10"))
+# status_code of a claimed key whose request has not finished yet.
+PENDING = 0
+# Session.info key for responses recorded in the current transaction, cached once it commits.
+_UNCOMMITTED = "idempotency_uncommitted"
+
+logger = logging.getLogger(__name__)
+
+
+def request_fingerprint(*parts) -> str:
+    raw = json.dumps(jsonable_encoder(parts), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class IdempotencyStore:
+    """Stored responses for ``Idempotency-Key`` retries.
+
+    ``reserve`` claims the key with a pending row, committed before the request does any
+    work, so a retry that arrives while the first attempt is still running waits for its
+    response instead of running the request a second time. The response is written into
+    that row in the same transaction as the booking itself, so a committed booking always
+    has its response stored. A bounded in-memory LRU, filled once that transaction
+    commits, sits in front of the table so replays in a retry storm skip the DB.
+    """
+
+    def __init__(self, ttl_seconds: int = IDEMPOTENCY_TTL_SECONDS, max_entries: int = IDEMPOTENCY_MEMORY_ENTRIES,
+                 pending_seconds: float = IDEMPOTENCY_PENDING_SECONDS, wait_seconds: float = IDEMPOTENCY_WAIT_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.pending_seconds = pending_seconds
+        self.wait_seconds = wait_seconds
+        self._entries: OrderedDict[tuple, tuple[float, str, int, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def reserve(self, db: Session, user_id: int, endpoint: str, key: str | None, fingerprint: str) -> JSONResponse | None:
+        """Claim ``key`` for this request, committing the claim.
+
+        Returns the stored response when the key was already used. While another attempt
+        with the key is in flight, waits up to ``wait_seconds`` for its response.
+        """
+        if not key:
+            return None
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            entry = self._stored(db, user_id, endpoint, key)
+            if entry is not None:
+                _, request_hash, status_code, body = entry
+                if request_hash != fingerprint:
+                    raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request")
+                if status_code != PENDING:
+                    return JSONResponse(json.loads(body), status_code=status_code, headers={"Idempotent-Replayed": "true"})
+            elif self._claim(db, user_id, endpoint, key, fingerprint):
+                return None
+            # Ends the read transaction, so the next look sees the other attempt's commit.
+            db.rollback()
+            if time.monotonic() >= deadline:
+                raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+            time.sleep(0.05)
+
+    def record(self, db: Session, user_id: int, endpoint: str, key: str | None, fingerprint: str, status_code: int, body) -> None:
+        """Store the response in the reserved row, in the caller's transaction; it counts only if that transaction commits."""
+        if not key:
+            return
+
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds)
+        response_body = json.dumps(jsonable_encoder(body))
+        db.query(IdempotencyRecord).filter(
+            IdempotencyRecord.user_id == user_id,
+            IdempotencyRecord.endpoint == endpoint,
+            IdempotencyRecord.key == key,
+        ).update({"status_code": status_code, "response_body": response_body, "expires_at": expires_at},
+                 synchronize_session=False)
+        db.info.setdefault(_UNCOMMITTED, []).append(
+            (self, (user_id, endpoint, key), (expires_at.timestamp(), fingerprint, status_code, response_body)))
+
+    def release(self, db: Session, user_id: int, endpoint: str, key: str | None) -> None:
+        """Drop this request's claim after it failed, so a retry runs the request again."""
+        if not key:
+            return
+        try:
+            db.rollback()
+            db.query(IdempotencyRecord).filter(
+                IdempotencyRecord.user_id == user_id,
+                IdempotencyRecord.endpoint == endpoint,
+                IdempotencyRecord.key == key,
+                IdempotencyRecord.status_code == PENDING,
+            ).delete(synchronize_session=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            # The claim lapses on its own after pending_seconds.
+            logger.exception("Could not release Idempotency-Key %r", key)
+
+    def _stored(self, db: Session, user_id: int, endpoint: str, key: str):
+        entry = self._get_cached((user_id, endpoint, key))
+        if entry is not None:
+            return entry
+        record = db.query(IdempotencyRecord).filter(
+            IdempotencyRecord.user_id == user_id,
+            IdempotencyRecord.endpoint == endpoint,
+            IdempotencyRecord.key == key,
+        ).first()
+        if record is None or _as_utc(record.expires_at) <= datetime.now(timezone.utc):
+            return None
+        entry = (_as_utc(record.expires_at).timestamp(), record.request_hash, record.status_code, record.response_body)
+        if record.status_code != PENDING:
+            self._put_cached((user_id, endpoint, key), entry)
+        return entry
+
+    def _claim(self, db: Session, user_id: int, endpoint: str, key: str, fingerprint: str) -> bool:
+        now = datetime.now(timezone.utc)
+        # An expired record with the same key, or an abandoned claim, would otherwise trip the unique constraint.
+        db.query(IdempotencyRecord).filter(
+            IdempotencyRecord.user_id == user_id,
+            IdempotencyRecord.endpoint == endpoint,
+            IdempotencyRecord.key == key,
+            IdempotencyRecord.expires_at <= now,
+        ).delete(synchronize_session=False)
+        db.add(IdempotencyRecord(
+            user_id=user_id,
+            endpoint=endpoint,
+            key=key,
+            request_hash=fingerprint,
+            status_code=PENDING,
+            response_body="",
+            expires_at=now + timedelta(seconds=self.pending_seconds),
+        ))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return False
+        return True
+
+    def purge_expired(self, db: Session) -> int:
+        deleted = db.query(IdempotencyRecord).filter(
+            IdempotencyRecord.expires_at <= datetime.now(timezone.utc)
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    def _get_cached(self, cache_key: tuple):
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[cache_key]
+                return None
+            self._entries.move_to_end(cache_key)
+            return entry
+
+    def _put_cached(self, cache_key: tuple, entry) -> None:
+        with self._lock:
+            self._entries[cache_key] = entry
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+@event.listens_for(Session, "after_commit")
+def _cache_committed(session: Session) -> None:
+    for store, cache_key, entry in session.info.pop(_UNCOMMITTED, ()):
+        store._put_cached(cache_key, entry)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session: Session) -> None:
+    session.info.pop(_UNCOMMITTED, None)
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+idempotency_store = IdempotencyStore()
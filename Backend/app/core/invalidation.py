@@ -0,0 +1,88 @@
+import logging
+import os
+import socket
+import tempfile
+import threading
+from collections import defaultdict
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+BUS_DIR = os.getenv("CACHE_BUS_DIR", os.path.join(tempfile.gettempdir(), "rental-cars-cache-bus"))
+
+
+class InvalidationBus:
+    """Broadcasts cache invalidations between worker processes on the same host.
+
+    Every worker binds a Unix datagram socket in ``BUS_DIR``; publishing sends the
+    topic to every other socket found there. Nothing is shared but the directory, and
+    a lost message only delays a refresh until the caches' own version checks run.
+    """
+
+    def __init__(self, directory: str = BUS_DIR):
+        self.directory = directory
+        self._handlers: dict[str, list[Callable[[], None]]] = defaultdict(list)
+        self._socket: socket.socket | None = None
+        self._path: str | None = None
+
+    def subscribe(self, topic: str, handler: Callable[[], None]) -> None:
+        self._handlers[topic].append(handler)
+
+    def start(self) -> None:
+        if self._socket is not None or not hasattr(socket, "AF_UNIX"):
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        # PIDs repeat across containers that share the directory; the hostname tells them apart.
+        self._path = os.path.join(self.directory, f"{socket.gethostname()}-{os.getpid()}.sock")
+        if os.path.exists(self._path):
+            os.unlink(self._path)
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._socket.bind(self._path)
+        threading.Thread(target=self._listen, args=(self._socket,), name="cache-invalidation-bus", daemon=True).start()
+
+    def stop(self) -> None:
+        if self._socket is None:
+            return
+        self._socket.close()
+        self._socket = None
+        if self._path and os.path.exists(self._path):
+            os.unlink(self._path)
+
+    def publish(self, topic: str) -> None:
+        """Run local handlers now and notify the other workers."""
+        self._dispatch(topic)
+        if self._socket is None:
+            return
+        message = topic.encode()
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if path == self._path or not name.endswith(".sock"):
+                continue
+            try:
+                self._socket.sendto(message, path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # The worker behind this socket is gone.
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+            except OSError as exc:
+                logger.warning("Could not deliver %r to %s: %s", topic, path, exc)
+
+    def _listen(self, sock: socket.socket) -> None:
+        while True:
+            try:
+                message = sock.recv(1024)
+            except OSError:
+                return
+            self._dispatch(message.decode())
+
+    def _dispatch(self, topic: str) -> None:
+        for handler in self._handlers.get(topic, ()):
+            try:
+                handler()
+            except Exception:
+                logger.exception("Invalidation handler for %r failed", topic)
+
+
+invalidation_bus = InvalidationBus()
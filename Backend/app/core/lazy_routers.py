@@ -0,0 +1,62 @@
+import importlib
+import threading
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# prefix -> module of a router outside the booking path, imported on its first request.
+LAZY_ROUTERS = {
+    "/analytics": "app.api.analytics",
+    "/archive": "app.api.archive",
+    "/audit": "app.api.audit",
+    "/events": "app.api.events",
+    "/live": "app.api.live",
+}
+# These list every route, so all deferred routers are mounted before they are served.
+SCHEMA_PATHS = ("/openapi.json", "/docs", "/redoc")
+
+
+class LazyRouters:
+    """Routers that ``app`` mounts the first time a request needs one instead of at import.
+
+    Importing a router pulls in its schemas, models and helpers; for admin and streaming
+    routes nobody hits right after a deploy that cost is moved off the cold start.
+    ``load`` without a prefix mounts the rest, which warm-up does for long-lived workers.
+    """
+
+    def __init__(self, app: FastAPI, routers: dict[str, str] = LAZY_ROUTERS):
+        self.app = app
+        self._pending = dict(routers)
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._pending)
+
+    def load(self, prefix: str | None = None) -> None:
+        with self._lock:
+            prefixes = list(self._pending) if prefix is None else [prefix]
+            for module in [self._pending.pop(p) for p in prefixes if p in self._pending]:
+                self.app.include_router(importlib.import_module(module).router)
+                # The cached OpenAPI document predates the new routes.
+                self.app.openapi_schema = None
+
+    def load_for(self, path: str) -> None:
+        if path in SCHEMA_PATHS:
+            self.load()
+            return
+        for prefix in list(self._pending):
+            if path == prefix or path.startswith(prefix + "/"):
+                self.load(prefix)
+
+
+class LazyRouterMiddleware:
+    """Mounts a deferred router before its first request is routed."""
+
+    def __init__(self, app: ASGIApp, routers: LazyRouters):
+        self.app = app
+        self.routers = routers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in ("http", "websocket") and self.routers.pending:
+            self.routers.load_for(scope["path"])
+        await self.app(scope, receive, send)
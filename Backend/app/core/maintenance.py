@@ -0,0 +1,97 @@
+import os
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+from app.core.http_cache import bump_collection_version
+from app.models.car import Car, CarServiceHistory
+from app.models.maintenance import CarMaintenance
+
+SERVICE_INTERVAL_KM = int(os.getenv("SERVICE_INTERVAL_KM", "15000"))
+SERVICE_INTERVAL_DAYS = int(os.getenv("SERVICE_INTERVAL_DAYS", "365"))
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def due_car_ids():
+    """Subquery of cars that must not be offered or booked until serviced."""
+    return select(CarMaintenance.car_id).where(CarMaintenance.is_due)
+
+
+def booking_blocked(db: Session, car_id: int, end_date: datetime) -> bool:
+    # due_date is stored in UTC and SQLite compares the text without its offset, so the
+    # request's end date is brought to UTC first.
+    end_date = _as_utc(end_date).astimezone(timezone.utc)
+    return db.query(CarMaintenance.car_id).filter(
+        CarMaintenance.car_id == car_id,
+        or_(CarMaintenance.is_due, CarMaintenance.due_date < end_date),
+    ).first() is not None
+
+
+def refresh_maintenance(db: Session, car_ids: list[int] | None = None, full: bool = False,
+                        now: datetime | None = None) -> tuple[int, int]:
+    """Recompute due state for stale cars in one set-based pass. Returns (cars checked, due state changes).
+
+    A car is stale when it has no row yet, was written to since the last run (mileage
+    updates touch ``updated_at``), got a new service record, or has crossed its due
+    date. ``full`` recomputes the whole fleet; ``car_ids`` limits the pass to those cars.
+    Cars with no service on record count from the mileage and time they were first seen.
+    """
+    now = now or datetime.now(timezone.utc)
+    services = (
+        select(
+            CarServiceHistory.car_id,
+            func.max(CarServiceHistory.id).label("last_id"),
+            func.max(CarServiceHistory.service_date).label("last_date"),
+            # Odometers only go up, so the highest reading is the latest service's.
+            func.max(CarServiceHistory.mileage).label("last_mileage"),
+        )
+        .group_by(CarServiceHistory.car_id)
+        .subquery()
+    )
+    query = (
+        select(Car.id, Car.mileage, services.c.last_id, services.c.last_date, services.c.last_mileage,
+               CarMaintenance.is_due, CarMaintenance.last_service_id, CarMaintenance.last_service_date,
+               CarMaintenance.last_service_mileage)
+        .outerjoin(services, services.c.car_id == Car.id)
+        .outerjoin(CarMaintenance, CarMaintenance.car_id == Car.id)
+    )
+    if car_ids is not None:
+        query = query.where(Car.id.in_(car_ids))
+    elif not full:
+        query = query.where(or_(
+            CarMaintenance.car_id.is_(None),
+            Car.updated_at >= CarMaintenance.computed_at,
+            func.coalesce(services.c.last_id, 0) != CarMaintenance.last_service_id,
+            ~CarMaintenance.is_due & (CarMaintenance.due_date <= now),
+        ))
+
+    rows, changed = [], 0
+    for (car_id, mileage, last_id, last_date, last_mileage, was_due,
+         seen_id, seen_date, seen_mileage) in db.execute(query):
+        if last_id is None:
+            if seen_id == 0:
+                last_date, last_mileage = seen_date, seen_mileage
+            else:
+                last_date, last_mileage = now, mileage or 0
+        last_date = _as_utc(last_date)
+        due_mileage = last_mileage + SERVICE_INTERVAL_KM
+        due_date = last_date + timedelta(days=SERVICE_INTERVAL_DAYS) if last_date else None
+        is_due = (mileage or 0) >= due_mileage or (due_date is not None and due_date <= now)
+        changed += bool(is_due) != bool(was_due)
+        rows.append({"car_id": car_id, "last_service_id": last_id or 0, "last_service_date": last_date,
+                     "last_service_mileage": last_mileage, "due_mileage": due_mileage, "due_date": due_date,
+                     "is_due": is_due})
+
+    if rows:
+        db.query(CarMaintenance).filter(CarMaintenance.car_id.in_([row["car_id"] for row in rows])) \
+            .delete(synchronize_session=False)
+        # Stamped by the database, the same clock as cars.updated_at in the staleness check above.
+        db.execute(CarMaintenance.__table__.insert().values(computed_at=func.now()), rows)
+    if changed:
+        bump_collection_version(db, "cars")
+    db.commit()
+    return len(rows), changed
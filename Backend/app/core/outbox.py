@@ -0,0 +1,136 @@
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete, func, update
+from sqlalchemy.orm import Session
+from app.core.idempotency import idempotency_store
+from app.core.invalidation import invalidation_bus
+from app.models.outbox import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_RETENTION_DAYS = int(os.getenv("OUTBOX_RETENTION_DAYS", "7"))
+
+
+def car_payload(car) -> dict:
+    return {"id": car.id, "status": car.status, "price_per_day": car.price_per_day, "type_id": car.type_id,
+            "fuel_id": car.fuel_id, "gearbox_id": car.gearbox_id}
+
+
+def rental_payload(rental) -> dict:
+    return {"id": rental.id, "car_id": rental.car_id, "user_id": rental.user_id, "status": rental.status,
+            "start_date": rental.start_date, "end_date": rental.end_date, "price_sum": rental.price_sum}
+
+
+def payment_payload(payment) -> dict:
+    return {"id": payment.id, "rental_id": payment.rental_id, "status": payment.status,
+            "amount": payment.amount, "paid_at": payment.paid_at}
+
+
+def record_event(db: Session, event_type: str, entity_id: int, payload: dict) -> None:
+    """Add a change record to the caller's transaction; it commits or rolls back with the change."""
+    db.add(OutboxEvent(event_type=event_type, entity_id=entity_id, payload=json.dumps(jsonable_encoder(payload))))
+
+
+def event_to_dict(event: OutboxEvent) -> dict:
+    return {
+        "id": event.id,
+        "event_type": event.event_type,
+        "entity_id": event.entity_id,
+        "payload": json.loads(event.payload),
+        "created_at": event.created_at,
+    }
+
+
+def read_events(db: Session, after: int, limit: int) -> list[dict]:
+    events = db.query(OutboxEvent).filter(OutboxEvent.id > after).order_by(OutboxEvent.id).limit(limit).all()
+    return [event_to_dict(event) for event in events]
+
+
+def latest_event_id(db: Session) -> int:
+    return db.query(func.max(OutboxEvent.id)).scalar() or 0
+
+
+class OutboxDispatcher:
+    """Drains undispatched outbox events in id order and hands each batch to the handlers.
+
+    A batch is marked dispatched only after every handler accepted it, so handlers
+    must tolerate seeing a batch again after a crash (delivery is at-least-once).
+    Run a single dispatcher per database (see ``app.jobs.dispatch_outbox``, which runs
+    one loop per branch database).
+    """
+
+    def __init__(self, batch_size: int = 500, retention_days: int = OUTBOX_RETENTION_DAYS):
+        self.batch_size = batch_size
+        self.retention_days = retention_days
+        self._handlers: list[Callable[[list[dict]], None]] = []
+        self._purged_at: dict = {}
+
+    def register(self, handler: Callable[[list[dict]], None]) -> None:
+        self._handlers.append(handler)
+
+    def dispatch_batch(self, db: Session) -> int:
+        events = (
+            db.query(OutboxEvent)
+            .filter(OutboxEvent.dispatched_at.is_(None))
+            .order_by(OutboxEvent.id)
+            .limit(self.batch_size)
+            .all()
+        )
+        if not events:
+            return 0
+
+        batch = [event_to_dict(event) for event in events]
+        for handler in self._handlers:
+            handler(batch)
+
+        db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_([event.id for event in events]))
+            .values(dispatched_at=datetime.now(timezone.utc))
+        )
+        db.commit()
+        return len(events)
+
+    def purge_dispatched(self, db: Session) -> int:
+        """Delete dispatched events past the retention window; /events readers must keep up within it."""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=self.retention_days)
+        result = db.execute(delete(OutboxEvent).where(OutboxEvent.dispatched_at < cutoff))
+        db.commit()
+        return result.rowcount
+
+    def run(self, session_factory, poll_interval: float = 1.0, once: bool = False) -> None:
+        while True:
+            db = session_factory()
+            try:
+                dispatched = self.dispatch_batch(db)
+                if time.monotonic() - self._purged_at.get(session_factory, float("-inf")) > 3600:
+                    self.purge_dispatched(db)
+                    idempotency_store.purge_expired(db)
+                    self._purged_at[session_factory] = time.monotonic()
+            except Exception:
+                db.rollback()
+                logger.exception("Outbox dispatch failed; retrying")
+                dispatched = 0
+            finally:
+                db.close()
+
+            if dispatched == self.batch_size:
+                continue
+            if once:
+                return
+            time.sleep(poll_interval)
+
+
+def publish_cache_invalidations(batch: list[dict]) -> None:
+    topics = {event["event_type"].split(".")[0] + "s" for event in batch}
+    for topic in topics:
+        invalidation_bus.publish(topic)
+
+
+outbox_dispatcher = OutboxDispatcher()
+outbox_dispatcher.register(publish_cache_invalidations)
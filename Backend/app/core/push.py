@@ -0,0 +1,142 @@
+import asyncio
+import json
+import logging
+import os
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
+from app.core.sharding import shard_router
+from app.core.invalidation import invalidation_bus
+from app.core.outbox import latest_event_id, read_events
+
+logger = logging.getLogger(__name__)
+
+PUSH_QUEUE_SIZE = int(os.getenv("PUSH_QUEUE_SIZE", "64"))
+PUSH_POLL_SECONDS = float(os.getenv("PUSH_POLL_SECONDS", "1"))
+RESYNC_MESSAGE = json.dumps({"type": "resync"})
+
+
+def public_message(event: dict) -> dict | None:
+    """What anonymous catalog clients may see of an outbox event: availability, never who booked."""
+    payload = event["payload"]
+    if event["event_type"].startswith("car."):
+        return {"id": event["id"], "type": event["event_type"], "car_id": payload["id"], "status": payload["status"]}
+    if event["event_type"].startswith("rental."):
+        return {"id": event["id"], "type": event["event_type"], "car_id": payload["car_id"], "status": payload["status"],
+                "start_date": payload["start_date"], "end_date": payload["end_date"]}
+    return None
+
+
+class Subscription:
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize)
+
+    def offer(self, message: str) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # The client is not keeping up. Drop what it has not read and tell it to
+            # reload the catalog instead of letting the backlog grow without bound.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_MESSAGE)
+
+
+class PushHub:
+    """Fans catalog availability changes out to this worker's live connections.
+
+    One background task per worker tails every branch's outbox (woken early by the ``cars`` and
+    ``rentals`` invalidation topics), serializes each event once and offers it to
+    every subscription's bounded queue, so database load does not grow with the
+    number of open tabs and a slow client only ever holds ``PUSH_QUEUE_SIZE`` messages.
+    """
+
+    def __init__(self, queue_size: int = PUSH_QUEUE_SIZE, poll_seconds: float = PUSH_POLL_SECONDS):
+        self.queue_size = queue_size
+        self.poll_seconds = poll_seconds
+        self._subscriptions: set[Subscription] = set()
+        self._cursors: list[int] | None = None
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.queue_size)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    def broadcast(self, message: str) -> None:
+        for subscription in self._subscriptions:
+            subscription.offer(message)
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def wake(self) -> None:
+        # Called from the invalidation bus thread.
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll()
+            except Exception:
+                logger.exception("Push hub poll failed")
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def poll(self) -> None:
+        if not self._subscriptions:
+            # Nobody is listening; start from the newest event when someone connects.
+            self._cursors = None
+            return
+        if self._cursors is None:
+            self._cursors = await run_in_threadpool(shard_router.fan_out, latest_event_id)
+            return
+        batches = await run_in_threadpool(self._fetch, list(self._cursors))
+        # Event ids are per branch database, so each branch keeps its own cursor.
+        for index, events in enumerate(batches):
+            for event in events:
+                self._cursors[index] = event["id"]
+                message = public_message(event)
+                if message is not None:
+                    self.broadcast(json.dumps(jsonable_encoder(message)))
+
+    @staticmethod
+    def _fetch(cursors: list[int]) -> list[list[dict]]:
+        batches = []
+        for shard, after in zip(shard_router.shards, cursors):
+            db = shard.session_factory()
+            try:
+                batches.append(read_events(db, after, 500))
+            finally:
+                db.close()
+        return batches
+
+
+push_hub = PushHub()
+invalidation_bus.subscribe("cars", push_hub.wake)
+invalidation_bus.subscribe("rentals", push_hub.wake)
@@ -0,0 +1,159 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.security import decode_access_token
+
+
+@dataclass(frozen=True)
+class RouteClass:
+    name: str
+    rate: float                      # tokens refilled per second
+    capacity: int                    # burst size
+    max_concurrency: int | None = None
+
+
+ROUTE_CLASSES = {
+    "login": RouteClass("login", rate=5 / 60, capacity=10, max_concurrency=4),
+    "register": RouteClass("register", rate=5 / 60, capacity=5, max_concurrency=2),
+    "admin": RouteClass("admin", rate=1, capacity=20, max_concurrency=4),
+    "default": RouteClass("default", rate=20, capacity=200),
+}
+
+# (method, path, exact match) -> route class; the first matching rule wins.
+ROUTE_RULES = [
+    ("POST", "/auth/token", True, "login"),
+    ("POST", "/users/", True, "register"),
+    ("GET", "/rentals/", True, "admin"),
+]
+# Classes hit before a client has a token; keyed by IP so a made-up Authorization header cannot buy a fresh bucket.
+IP_KEYED_CLASSES = {"login", "register"}
+
+
+def classify_route(method: str, path: str) -> RouteClass:
+    for rule_method, rule_path, exact, class_name in ROUTE_RULES:
+        if method != rule_method:
+            continue
+        if path == rule_path if exact else path.startswith(rule_path):
+            return ROUTE_CLASSES[class_name]
+    return ROUTE_CLASSES["default"]
+
+
+class TokenBucketStore(ABC):
+    """Backend interface for token buckets; swap in a shared store for multi-host setups."""
+
+    @abstractmethod
+    def consume(self, key: str, rate: float, capacity: int, cost: float = 1.0) -> tuple[bool, float]:
+        """Take ``cost`` tokens. Returns (allowed, seconds until enough tokens are available)."""
+
+
+class MemoryTokenBucketStore(TokenBucketStore):
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, rate: float, capacity: int, cost: float = 1.0) -> tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    self._evict(now)
+                bucket = self._buckets[key] = [float(capacity), now]
+
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if tokens >= cost:
+                bucket[0] = tokens - cost
+                return True, 0.0
+            bucket[0] = tokens
+            return False, (cost - tokens) / rate
+
+    def _evict(self, now: float) -> None:
+        # Buckets idle for a minute or more are (nearly) full again, so forgetting them is harmless.
+        stale = [key for key, (_, updated) in self._buckets.items() if now - updated > 60]
+        for key in stale:
+            del self._buckets[key]
+        if len(self._buckets) >= self.max_keys:
+            self._buckets.clear()
+
+
+class RateLimitMiddleware:
+    """Per-client token buckets by route class, plus concurrency caps for expensive routes.
+
+    Clients are keyed by user id once their bearer token verifies, otherwise by IP; login
+    and registration are always keyed by IP. Requests over the
+    rate get 429, requests over a route class's concurrency cap get 503; both are
+    rejected before the endpoint runs.
+    """
+
+    def __init__(self, app: ASGIApp, store: TokenBucketStore | None = None, enabled: bool = True,
+                 max_cached_tokens: int = 10_000):
+        self.app = app
+        self.store = store or MemoryTokenBucketStore()
+        self.enabled = enabled
+        self.max_cached_tokens = max_cached_tokens
+        self._in_flight: dict[str, int] = {}
+        # Authorization header -> (user id, expiry); only verified tokens are cached.
+        self._verified_tokens: dict[bytes, tuple[int, float]] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        route_class = classify_route(scope["method"], scope["path"])
+        allowed, retry_after = self.store.consume(
+            f"{route_class.name}:{self._client_key(scope, route_class)}", route_class.rate, route_class.capacity
+        )
+        if not allowed:
+            response = JSONResponse({"detail": "Too many requests"}, status_code=429,
+                                    headers={"Retry-After": str(max(1, round(retry_after)))})
+            await response(scope, receive, send)
+            return
+
+        if route_class.max_concurrency is None:
+            await self.app(scope, receive, send)
+            return
+
+        in_flight = self._in_flight.get(route_class.name, 0)
+        if in_flight >= route_class.max_concurrency:
+            response = JSONResponse({"detail": "Server busy, try again later"}, status_code=503,
+                                    headers={"Retry-After": "1"})
+            await response(scope, receive, send)
+            return
+
+        self._in_flight[route_class.name] = in_flight + 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._in_flight[route_class.name] -= 1
+
+    def _client_key(self, scope: Scope, route_class: RouteClass) -> str:
+        client = scope.get("client")
+        ip_key = "ip:" + (client[0] if client else "unknown")
+        if route_class.name in IP_KEYED_CLASSES:
+            return ip_key
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                user_id = self._verified_user_id(value)
+                return ip_key if user_id is None else f"user:{user_id}"
+        return ip_key
+
+    def _verified_user_id(self, header: bytes) -> int | None:
+        now = time.time()
+        cached = self._verified_tokens.get(header)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+
+        scheme, _, token = header.decode("latin-1").partition(" ")
+        claims = decode_access_token(token) if scheme.lower() == "bearer" and token else None
+        if claims is None or claims.get("id") is None:
+            return None
+        if len(self._verified_tokens) >= self.max_cached_tokens:
+            self._verified_tokens.clear()
+        self._verified_tokens[header] = (claims["id"], claims.get("exp", now))
+        return claims["id"]
@@ -0,0 +1,82 @@
+import os
+import threading
+import time
+from sqlalchemy.orm import Session
+from app.core.http_cache import bump_collection_version, get_collection_version
+from app.core.invalidation import invalidation_bus
+from app.models.car import CarType, FuelType, GearboxType, Tag
+
+REFERENCE_MODELS = {
+    "car_types": CarType,
+    "fuel_types": FuelType,
+    "gearbox_types": GearboxType,
+    "tags": Tag,
+}
+REFERENCE_VERSION_KEY = "reference_data"
+REFERENCE_CHECK_SECONDS = float(os.getenv("REFERENCE_CHECK_SECONDS", "5"))
+
+
+class ReferenceDataCache:
+    """Process-wide name <-> id maps for the small lookup tables.
+
+    Loaded in full on first use. Writers call ``mark_changed`` inside their transaction
+    and publish ``reference_data`` on the invalidation bus after commit; workers that
+    miss the message still pick the change up through the ``reference_data`` collection
+    version, which is checked at most every ``REFERENCE_CHECK_SECONDS``.
+    """
+
+    def __init__(self, check_seconds: float = REFERENCE_CHECK_SECONDS):
+        self.check_seconds = check_seconds
+        self._ids_by_name: dict[str, dict[str, int]] = {}
+        self._names_by_id: dict[str, dict[int, str]] = {}
+        self._version: int | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def load(self, db: Session) -> None:
+        version, _ = get_collection_version(db, REFERENCE_VERSION_KEY)
+        ids_by_name, names_by_id = {}, {}
+        for kind, model in REFERENCE_MODELS.items():
+            rows = db.query(model.id, model.name).all()
+            ids_by_name[kind] = {name: id_ for id_, name in rows}
+            names_by_id[kind] = {id_: name for id_, name in rows}
+        with self._lock:
+            self._ids_by_name, self._names_by_id = ids_by_name, names_by_id
+            self._version = version
+            self._checked_at = time.monotonic()
+
+    def ensure_fresh(self, db: Session) -> None:
+        if self._version is None:
+            self.load(db)
+            return
+        if time.monotonic() - self._checked_at < self.check_seconds:
+            return
+        version, _ = get_collection_version(db, REFERENCE_VERSION_KEY)
+        if version != self._version:
+            self.load(db)
+        else:
+            self._checked_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version = None
+
+    def id_for(self, db: Session, kind: str, name: str) -> int | None:
+        self.ensure_fresh(db)
+        return self._ids_by_name[kind].get(name)
+
+    def name_for(self, db: Session, kind: str, id_: int) -> str | None:
+        self.ensure_fresh(db)
+        return self._names_by_id[kind].get(id_)
+
+    def items(self, db: Session, kind: str) -> list[dict]:
+        self.ensure_fresh(db)
+        return [{"id": id_, "name": name} for id_, name in sorted(self._names_by_id[kind].items())]
+
+
+def mark_changed(db: Session) -> None:
+    bump_collection_version(db, REFERENCE_VERSION_KEY)
+
+
+reference_data = ReferenceDataCache()
+invalidation_bus.subscribe(REFERENCE_VERSION_KEY, reference_data.invalidate)
@@ -0,0 +1,132 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+from app.core.database import dialect_insert
+from app.models.analytics import CarDailyStats, CarTypeDailyStats
+from app.models.archive import ArchivedRental, ArchivedPayment
+from app.models.car import Car
+from app.models.rental import Rental, Payment
+
+ROLLUP_METRICS = ("booked_hours", "rentals_finished", "billed_amount", "paid_amount")
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def split_hours_by_day(start: datetime, end: datetime) -> dict[date, float]:
+    start, end = _as_utc(start), _as_utc(end)
+    hours = {}
+    cursor = start
+    while cursor < end:
+        next_midnight = datetime.combine(cursor.date() + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        chunk_end = min(end, next_midnight)
+        hours[cursor.date()] = hours.get(cursor.date(), 0.0) + (chunk_end - cursor).total_seconds() / 3600
+        cursor = chunk_end
+    return hours
+
+
+def _upsert_increments(db: Session, model, key_columns: tuple[str, ...], rows: list[dict]) -> None:
+    if not rows:
+        return
+    stmt = dialect_insert(db, model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(key_columns),
+        set_={name: getattr(model, name) + getattr(stmt.excluded, name) for name in ROLLUP_METRICS},
+    )
+    db.execute(stmt, rows)
+
+
+def _row(keys: dict, **metrics) -> dict:
+    row = dict(keys)
+    row.update({name: 0 for name in ROLLUP_METRICS})
+    row.update(metrics)
+    row["rentals_finished"] = int(row["rentals_finished"])
+    return row
+
+
+def record_rental_finished(db: Session, rental, car) -> None:
+    """Add a finished rental to the daily rollups; runs in the caller's transaction."""
+    started = rental.started_at or rental.start_date
+    returned = rental.returned_at
+    per_day = {day: {"booked_hours": hours} for day, hours in split_hours_by_day(started, returned).items()}
+    per_day.setdefault(_as_utc(returned).date(), {}).update(rentals_finished=1, billed_amount=Decimal(rental.price_sum))
+
+    car_rows = [_row({"day": day, "car_id": car.id}, type_id=car.type_id, **m) for day, m in per_day.items()]
+    _upsert_increments(db, CarDailyStats, ("day", "car_id"), car_rows)
+    if car.type_id is not None:
+        type_rows = [_row({"day": day, "type_id": car.type_id}, **m) for day, m in per_day.items()]
+        _upsert_increments(db, CarTypeDailyStats, ("day", "type_id"), type_rows)
+
+
+def record_payment_paid(db: Session, payment, car) -> None:
+    day = _as_utc(payment.paid_at).date()
+    amount = Decimal(payment.amount)
+    _upsert_increments(db, CarDailyStats, ("day", "car_id"),
+                       [_row({"day": day, "car_id": car.id}, type_id=car.type_id, paid_amount=amount)])
+    if car.type_id is not None:
+        _upsert_increments(db, CarTypeDailyStats, ("day", "type_id"),
+                           [_row({"day": day, "type_id": car.type_id}, paid_amount=amount)])
+
+
+def _empty_metrics() -> dict:
+    return {"booked_hours": 0.0, "rentals_finished": 0, "billed_amount": Decimal(0), "paid_amount": Decimal(0)}
+
+
+def rebuild_rollups(db: Session, batch_size: int = 10_000) -> int:
+    """Recompute both rollup tables from rentals and payments. Returns the number of rentals read."""
+    per_car = defaultdict(_empty_metrics)
+    car_types = {}
+    count = 0
+
+    # Archived history counts too; its tables share the hot tables' column names.
+    for rental_model, payment_model in ((Rental, Payment), (ArchivedRental, ArchivedPayment)):
+        rentals = (
+            db.query(rental_model.car_id, Car.type_id, rental_model.start_date, rental_model.started_at,
+                     rental_model.returned_at, rental_model.price_sum)
+            .join(Car, Car.id == rental_model.car_id)
+            .filter(rental_model.status == "FINISHED", rental_model.returned_at.is_not(None))
+            .yield_per(batch_size)
+        )
+        for car_id, type_id, start_date, started_at, returned_at, price_sum in rentals:
+            car_types[car_id] = type_id
+            for day, hours in split_hours_by_day(started_at or start_date, returned_at).items():
+                per_car[(day, car_id)]["booked_hours"] += hours
+            bucket = per_car[(_as_utc(returned_at).date(), car_id)]
+            bucket["rentals_finished"] += 1
+            bucket["billed_amount"] += Decimal(price_sum)
+            count += 1
+
+        payments = (
+            db.query(rental_model.car_id, Car.type_id, payment_model.paid_at, payment_model.amount)
+            .join(rental_model, rental_model.id == payment_model.rental_id)
+            .join(Car, Car.id == rental_model.car_id)
+            .filter(payment_model.status == "PAID", payment_model.paid_at.is_not(None))
+            .yield_per(batch_size)
+        )
+        for car_id, type_id, paid_at, amount in payments:
+            car_types[car_id] = type_id
+            per_car[(_as_utc(paid_at).date(), car_id)]["paid_amount"] += Decimal(amount)
+
+    per_type = defaultdict(_empty_metrics)
+    for (day, car_id), metrics in per_car.items():
+        type_id = car_types[car_id]
+        if type_id is None:
+            continue
+        for name, value in metrics.items():
+            per_type[(day, type_id)][name] += value
+
+    db.execute(delete(CarDailyStats))
+    db.execute(delete(CarTypeDailyStats))
+    car_rows = [_row({"day": day, "car_id": car_id}, type_id=car_types[car_id], **m) for (day, car_id), m in per_car.items()]
+    type_rows = [_row({"day": day, "type_id": type_id}, **m) for (day, type_id), m in per_type.items()]
+    for start in range(0, len(car_rows), batch_size):
+        db.execute(CarDailyStats.__table__.insert(), car_rows[start:start + batch_size])
+    for start in range(0, len(type_rows), batch_size):
+        db.execute(CarTypeDailyStats.__table__.insert(), type_rows[start:start + batch_size])
+    db.commit()
+    return count
@@ -1,11 +1,30 @@
-from passlib.context import CryptContext
+import os
+from functools import lru_cache
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+SECRET_KEY = os.getenv("SECRET_KEY", "your_secret_key")
+ALGORITHM = "HS256"
+
+
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    # passlib (and bcrypt behind it) is only needed by login and registration,
+    # so it is imported on first use instead of at startup.
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+def decode_access_token(token: str) -> dict | None:
+    """The claims of a token signed with SECRET_KEY and not expired, else None."""
+    from jose import JWTError, jwt
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
@@ -0,0 +1,181 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, TypeVar
+from fastapi import Depends, Header, HTTPException
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from app.core import database
+from app.core.database import Base, get_db, make_engine
+from app.core.http_cache import get_collection_version
+from app.core.reference_data import REFERENCE_VERSION_KEY
+from app.models.car import CarType, FuelType, GearboxType, Tag
+from app.models.version import CollectionVersion
+
+# Branches beyond the default one, which lives in DATABASE_URL:
+#   BRANCH_DATABASES="north=sqlite+pysqlite:////data/north.db,south=postgresql://..."
+BRANCH_DATABASES = os.getenv("BRANCH_DATABASES", "")
+DEFAULT_BRANCH = os.getenv("DEFAULT_BRANCH", "main")
+# Branch n hands out car, rental and payment ids above n << SHARD_ID_BITS, so an id alone names its branch.
+SHARD_ID_BITS = 40
+ID_RANGE_TABLES = ("cars", "rentals", "payments")
+REFERENCE_MODELS = (CarType, FuelType, GearboxType, Tag)
+
+T = TypeVar("T")
+
+
+@dataclass
+class Shard:
+    name: str
+    index: int
+    engine: Engine
+    session_factory: sessionmaker
+
+    @property
+    def first_id(self) -> int:
+        return self.index << SHARD_ID_BITS
+
+
+class ShardRouter:
+    """Maps branches to databases.
+
+    Cars, their rentals and payments, and everything written in the same transactions
+    (outbox, rollups, idempotency keys, maintenance, summaries) live in the car's branch
+    database, so bookings in different branches never wait on the same write lock. Users
+    and the reference tables stay in the default branch's database; the reference rows are
+    mirrored into every branch so relationships load locally. Branch tables keep user ids
+    without a foreign key, since the users table is in another database.
+
+    With no ``BRANCH_DATABASES`` there is a single shard backed by ``app.core.database``.
+    """
+
+    def __init__(self, spec: str = BRANCH_DATABASES):
+        self.shards = [Shard(DEFAULT_BRANCH, 0, database.engine, database.SessionLocal)]
+        for item in filter(None, (part.strip() for part in spec.split(","))):
+            name, _, url = item.partition("=")
+            shard_engine = make_engine(url.strip())
+            self.shards.append(Shard(name.strip(), len(self.shards), shard_engine,
+                                     sessionmaker(bind=shard_engine, autoflush=False, autocommit=False, expire_on_commit=False)))
+        self._by_name = {shard.name: shard for shard in self.shards}
+        self._pool = ThreadPoolExecutor(max_workers=len(self.shards), thread_name_prefix="shard") if self.sharded else None
+
+    @property
+    def sharded(self) -> bool:
+        return len(self.shards) > 1
+
+    def by_name(self, name: str) -> Shard:
+        shard = self._by_name.get(name)
+        if shard is None:
+            raise HTTPException(status_code=400, detail=f"Unknown branch: {name}")
+        return shard
+
+    def for_id(self, entity_id: int) -> Shard | None:
+        index = entity_id >> SHARD_ID_BITS
+        return self.shards[index] if 0 <= index < len(self.shards) else None
+
+    def fan_out(self, fn: Callable[[Session], T]) -> list[T]:
+        """Run ``fn`` with a session on every branch, in parallel, and return the results in branch order."""
+        def run(shard: Shard) -> T:
+            db = shard.session_factory()
+            try:
+                return fn(db)
+            finally:
+                db.close()
+
+        if self._pool is None:
+            return [run(self.shards[0])]
+        return list(self._pool.map(run, self.shards))
+
+
+def reserve_id_range(shard: Shard) -> None:
+    with shard.engine.begin() as connection:
+        for table in ID_RANGE_TABLES:
+            if shard.engine.dialect.name == "sqlite":
+                connection.execute(text("UPDATE sqlite_sequence SET seq = :start WHERE name = :table AND seq < :start"),
+                                   {"table": table, "start": shard.first_id})
+                connection.execute(text("INSERT INTO sqlite_sequence (name, seq) SELECT :table, :start "
+                                        "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = :table)"),
+                                   {"table": table, "start": shard.first_id})
+            elif shard.engine.dialect.name == "postgresql":
+                connection.execute(text(f"SELECT setval(pg_get_serial_sequence(:table, 'id'), "
+                                        f"GREATEST(:start, (SELECT COALESCE(MAX(id), 0) FROM {table})))"),
+                                   {"table": table, "start": shard.first_id})
+            else:
+                raise NotImplementedError(f"Cannot reserve id ranges on {shard.engine.dialect.name}")
+
+
+def sync_reference_data(ref_db: Session, db: Session, force: bool = False) -> None:
+    """Copy the reference rows into a branch database whose copy is behind, in ``db``'s transaction.
+
+    A branch's ``reference_data`` collection version records the default branch's version
+    it last copied. Car writes call this before referencing lookup rows.
+    """
+    if db is ref_db:
+        return
+    version, _ = get_collection_version(ref_db, REFERENCE_VERSION_KEY)
+    if not force and get_collection_version(db, REFERENCE_VERSION_KEY)[0] == version:
+        return
+    for model in REFERENCE_MODELS:
+        for row in ref_db.query(model.id, model.name):
+            db.merge(model(id=row.id, name=row.name))
+    db.merge(CollectionVersion(name=REFERENCE_VERSION_KEY, version=version, updated_at=datetime.now(timezone.utc)))
+
+
+def mirror_reference_data(shard: Shard) -> None:
+    source = database.SessionLocal()
+    target = shard.session_factory()
+    try:
+        sync_reference_data(source, target, force=True)
+        target.commit()
+    finally:
+        source.close()
+        target.close()
+
+
+def prepare_shards() -> None:
+    """Create the schema in every branch database, then give the extra branches their id ranges and reference rows."""
+    for shard in shard_router.shards:
+        Base.metadata.create_all(shard.engine)
+    for shard in shard_router.shards[1:]:
+        reserve_id_range(shard)
+        mirror_reference_data(shard)
+
+
+def _shard_session(shard: Shard, db: Session):
+    # The default branch reuses the request's session, so single-database setups open one session as before.
+    if shard.index == 0:
+        yield db
+        return
+    shard_db = shard.session_factory()
+    try:
+        yield shard_db
+    finally:
+        shard_db.close()
+
+
+def shard_session_for_id(entity_id: int, db: Session, detail: str):
+    shard = shard_router.for_id(entity_id)
+    if shard is None:
+        raise HTTPException(status_code=404, detail=detail)
+    yield from _shard_session(shard, db)
+
+
+def get_branch_db(branch: str | None = Header(None, alias="X-Branch"), db: Session = Depends(get_db)):
+    yield from _shard_session(shard_router.by_name(branch or DEFAULT_BRANCH), db)
+
+
+def get_car_db(car_id: int, db: Session = Depends(get_db)):
+    yield from shard_session_for_id(car_id, db, "Car not found")
+
+
+def get_rental_db(rental_id: int, db: Session = Depends(get_db)):
+    yield from shard_session_for_id(rental_id, db, "Rental not found")
+
+
+def get_payment_db(payment_id: int, db: Session = Depends(get_db)):
+    yield from shard_session_for_id(payment_id, db, "Payment not found")
+
+
+shard_router = ShardRouter()
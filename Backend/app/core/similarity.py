@@ -0,0 +1,164 @@
+import bisect
+import heapq
+import os
+import threading
+import time
+from array import array
+from collections import defaultdict
+from sqlalchemy.orm import Session
+from app.core.http_cache import bump_collection_version, get_collection_version
+from app.models.car import Car, CarTags
+
+FEATURES_VERSION_KEY = "car_features"
+FEATURES_CHECK_SECONDS = float(os.getenv("FEATURES_CHECK_SECONDS", "5"))
+PRICE_BAND = float(os.getenv("ALTERNATIVES_PRICE_BAND", "0.3"))
+
+
+def mark_features_changed(db: Session) -> None:
+    """Call in the same transaction as any change to a car's descriptive fields or tags."""
+    bump_collection_version(db, FEATURES_VERSION_KEY)
+
+
+class FleetFeatures:
+    """Compact per-worker copy of the car attributes used to rank alternatives.
+
+    Columns live in typed arrays indexed by row, with tags packed into one integer bitmask
+    per car. Rows are also bucketed by (type, fuel, gearbox, seats) and sorted by price
+    within each bucket, which bounds the best score any further car in a bucket can reach;
+    ``top`` walks the buckets outward from the car's price, best bound first, and stops once
+    no bound can beat the current results. Status and bookings change far more often than
+    these attributes and are checked against the database at query time instead. Staleness
+    is detected through the ``car_features`` collection version, at most every
+    ``FEATURES_CHECK_SECONDS``.
+    """
+
+    def __init__(self, check_seconds: float = FEATURES_CHECK_SECONDS):
+        self.check_seconds = check_seconds
+        self.ids = array("q")
+        self.fuel_ids = array("q")
+        self.gearbox_ids = array("q")
+        self.seats = array("q")
+        self.prices = array("d")
+        self.tag_masks: list[int] = []
+        self.type_by_id: dict[int, int] = {}
+        # (type, fuel, gearbox, seats) -> (rows sorted by price, their prices)
+        self.buckets: dict[tuple, tuple[array, array]] = {}
+        self.row_by_id: dict[int, int] = {}
+        self._version: int | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def load(self, db: Session) -> None:
+        version, _ = get_collection_version(db, FEATURES_VERSION_KEY)
+        masks = defaultdict(int)
+        for car_id, tag_id in db.query(CarTags.car_id, CarTags.tag_id).yield_per(50_000):
+            masks[car_id] |= 1 << tag_id
+
+        ids, fuel_ids, gearbox_ids, seats, prices = array("q"), array("q"), array("q"), array("q"), array("d")
+        tag_masks, type_by_id, row_by_id = [], {}, {}
+        buckets = defaultdict(lambda: (array("q"), array("d")))
+        cars = db.query(Car.id, Car.type_id, Car.fuel_id, Car.gearbox_id, Car.seats, Car.price_per_day) \
+            .filter(Car.status != "DISABLED").order_by(Car.type_id, Car.price_per_day).yield_per(50_000)
+        for row, (car_id, type_id, fuel_id, gearbox_id, car_seats, price) in enumerate(cars):
+            ids.append(car_id)
+            fuel_ids.append(fuel_id or 0)
+            gearbox_ids.append(gearbox_id or 0)
+            seats.append(car_seats or 0)
+            prices.append(float(price or 0))
+            tag_masks.append(masks.get(car_id, 0))
+            type_by_id[car_id] = type_id or 0
+            row_by_id[car_id] = row
+            # Cars arrive sorted by price within a type, so every bucket stays sorted.
+            bucket_rows, bucket_prices = buckets[(type_id or 0, fuel_id or 0, gearbox_id or 0, car_seats or 0)]
+            bucket_rows.append(row)
+            bucket_prices.append(prices[row])
+
+        with self._lock:
+            self.ids, self.fuel_ids, self.gearbox_ids, self.seats, self.prices = ids, fuel_ids, gearbox_ids, seats, prices
+            self.tag_masks, self.type_by_id, self.row_by_id = tag_masks, type_by_id, row_by_id
+            self.buckets = dict(buckets)
+            self._version = version
+            self._checked_at = time.monotonic()
+
+    def ensure_fresh(self, db: Session) -> None:
+        if self._version is None:
+            self.load(db)
+            return
+        if time.monotonic() - self._checked_at < self.check_seconds:
+            return
+        version, _ = get_collection_version(db, FEATURES_VERSION_KEY)
+        if version != self._version:
+            self.load(db)
+        else:
+            self._checked_at = time.monotonic()
+
+    def top(self, db: Session, car_id: int, count: int, widen: bool = False) -> list[int]:
+        """Ids of the ``count`` cars most similar to ``car_id``, best first.
+
+        Only same-type cars in the price band are considered unless ``widen`` is set, in which
+        case the whole fleet is; callers widen only when the narrow pass comes up short.
+        """
+        self.ensure_fresh(db)
+        row = self.row_by_id.get(car_id)
+        if row is None or count <= 0:
+            return []
+        type_id = self.type_by_id[car_id]
+        fuel_id, gearbox_id, seats = self.fuel_ids[row], self.gearbox_ids[row], self.seats[row]
+        price, mask = self.prices[row] or 1.0, self.tag_masks[row]
+        ids, masks = self.ids, self.tag_masks
+        if widen:
+            low, high = float("-inf"), float("inf")
+        else:
+            low, high = price * (1 - PRICE_BAND), price * (1 + PRICE_BAND)
+
+        # Each bucket is walked in both directions from the car's price. A car's score is at most
+        # its bucket's fuel, gearbox and seat terms, plus a full tag match, minus its price term.
+        walks, frontier = [], []
+        for (bucket_type, bucket_fuel, bucket_gearbox, bucket_seats), (rows, prices) in self.buckets.items():
+            if not widen and bucket_type != type_id:
+                continue
+            ceiling = (bucket_fuel == fuel_id) + (bucket_gearbox == gearbox_id) - 0.25 * abs(bucket_seats - seats)
+            walk = len(walks)
+            walks.append((rows, prices, ceiling))
+            start = bisect.bisect_left(prices, price)
+            for index, step in ((start - 1, -1), (start, 1)):
+                if 0 <= index < len(rows) and low <= prices[index] <= high:
+                    frontier.append((-(ceiling + 2.0 - 2.0 * abs(prices[index] - price) / price), walk, index, step))
+        heapq.heapify(frontier)
+
+        best = []
+        while frontier:
+            negative_bound, walk, index, step = heapq.heappop(frontier)
+            # The small margin keeps float rounding from pruning a car that would tie.
+            if len(best) == count and -negative_bound + 1e-9 < best[0][0]:
+                break
+            rows, prices, ceiling = walks[walk]
+            other = rows[index]
+            if other != row:
+                other_mask = masks[other]
+                union = (mask | other_mask).bit_count()
+                scored = (
+                    ceiling
+                    - 2.0 * abs(prices[index] - price) / price
+                    + (2.0 * (mask & other_mask).bit_count() / union if union else 0.0),
+                    ids[other],
+                )
+                if len(best) < count:
+                    heapq.heappush(best, scored)
+                elif scored > best[0]:
+                    heapq.heapreplace(best, scored)
+            index += step
+            if 0 <= index < len(rows) and low <= prices[index] <= high:
+                heapq.heappush(frontier, (-(ceiling + 2.0 - 2.0 * abs(prices[index] - price) / price), walk, index, step))
+        return [other_id for _, other_id in sorted(best, reverse=True)]
+
+
+_features_by_engine: dict = {}
+_features_lock = threading.Lock()
+
+
+def fleet_features_for(db: Session) -> FleetFeatures:
+    """The features of the fleet in ``db``'s database; each branch database gets its own copy."""
+    bind = db.get_bind()
+    with _features_lock:
+        return _features_by_engine.setdefault(bind, FleetFeatures())
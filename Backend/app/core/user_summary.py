@@ -0,0 +1,119 @@
+import json
+from decimal import Decimal
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import Session
+from app.core.database import dialect_insert
+from app.models.archive import ArchivedRental, ArchivedPayment
+from app.models.rental import Rental, Payment
+from app.models.user_summary import UserRentalSummary
+from app.schemas.rental import PaymentResponseSchema, RentalResponseSchema
+
+
+def _open_items(db: Session, user_id: int) -> str:
+    """Active and upcoming rentals and unpaid payments: the small, non-historical part of a user's data."""
+    open_rentals = (
+        db.query(Rental)
+        .filter(Rental.user_id == user_id, Rental.status.in_(("NOT_STARTED", "ACTIVE")))
+        .order_by(Rental.start_date)
+        .all()
+    )
+    active = next((r for r in open_rentals if r.status == "ACTIVE"), None)
+    upcoming = next((r for r in open_rentals if r.status == "NOT_STARTED"), None)
+    unpaid = (
+        db.query(Payment)
+        .join(Rental, Rental.id == Payment.rental_id)
+        .filter(Rental.user_id == user_id, Rental.status == "FINISHED", Payment.status == "NOT_PAID")
+        .order_by(Payment.id)
+        .all()
+    )
+    return json.dumps(jsonable_encoder({
+        "active_rental": RentalResponseSchema.model_validate(active) if active else None,
+        "upcoming_rental": RentalResponseSchema.model_validate(upcoming) if upcoming else None,
+        "outstanding_payments": [PaymentResponseSchema.model_validate(p) for p in unpaid],
+    }))
+
+
+def build_user_summary(db: Session, user_id: int) -> UserRentalSummary:
+    """Compute a summary from the full history, hot and archived. Used once per user; transitions keep it current."""
+    rentals_count = finished_count = 0
+    paid_amount = Decimal(0)
+    for rental_model, payment_model in ((Rental, Payment), (ArchivedRental, ArchivedPayment)):
+        total, finished = db.query(func.count(), func.count().filter(rental_model.status == "FINISHED")) \
+            .select_from(rental_model).filter(rental_model.user_id == user_id).one()
+        paid = db.query(func.coalesce(func.sum(payment_model.amount), 0)) \
+            .join(rental_model, rental_model.id == payment_model.rental_id) \
+            .filter(rental_model.user_id == user_id, payment_model.status == "PAID").scalar()
+        rentals_count += total
+        finished_count += finished
+        paid_amount += Decimal(paid)
+    return UserRentalSummary(user_id=user_id, rentals_count=rentals_count, finished_count=finished_count,
+                             paid_amount=paid_amount, open_items=_open_items(db, user_id))
+
+
+def get_user_summary(db: Session, user_id: int) -> UserRentalSummary:
+    summary = db.get(UserRentalSummary, user_id)
+    if summary is not None:
+        return summary
+
+    summary = build_user_summary(db, user_id)
+    db.add(summary)
+    try:
+        db.commit()
+    except (IntegrityError, OperationalError):
+        # Another request stored the row first, or a booking holds the write lock (SQLite). That
+        # booking builds the row in its own transaction, so this one is served without storing it.
+        db.rollback()
+        return db.get(UserRentalSummary, user_id) or build_user_summary(db, user_id)
+    return db.get(UserRentalSummary, user_id)
+
+
+def update_user_summary(db: Session, user_id: int, rentals: int = 0, finished: int = 0, paid: Decimal = Decimal(0)) -> None:
+    """Apply one rental or payment transition to the user's summary, in the caller's transaction.
+
+    Counters move by the given deltas and the open items are re-read, which touches only
+    the user's open rentals and unpaid payments. A user without a row gets one built from
+    history here, after the transition is flushed, so a lazy build racing this transaction
+    either loses on the primary key or is picked up by the delta update.
+    """
+    db.flush()
+    if db.query(UserRentalSummary.user_id).filter(UserRentalSummary.user_id == user_id).first() is None:
+        summary = build_user_summary(db, user_id)
+        inserted = db.execute(
+            dialect_insert(db, UserRentalSummary)
+            .values(user_id=user_id, rentals_count=summary.rentals_count, finished_count=summary.finished_count,
+                    paid_amount=summary.paid_amount, open_items=summary.open_items, version=1)
+            .on_conflict_do_nothing(index_elements=["user_id"])
+        )
+        if inserted.rowcount:
+            return
+    db.execute(
+        update(UserRentalSummary)
+        .where(UserRentalSummary.user_id == user_id)
+        .values(
+            rentals_count=UserRentalSummary.rentals_count + rentals,
+            finished_count=UserRentalSummary.finished_count + finished,
+            paid_amount=UserRentalSummary.paid_amount + paid,
+            open_items=_open_items(db, user_id),
+            version=UserRentalSummary.version + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def merge_summaries(summaries: list[UserRentalSummary]) -> dict:
+    """Combine a user's summaries from several branch databases into one response."""
+    items = [json.loads(summary.open_items) for summary in summaries]
+    active = [i["active_rental"] for i in items if i["active_rental"]]
+    upcoming = sorted((i["upcoming_rental"] for i in items if i["upcoming_rental"]), key=lambda r: r["start_date"])
+    outstanding = sorted((p for i in items for p in i["outstanding_payments"]), key=lambda p: p["id"])
+    return {
+        "rentals_count": sum(summary.rentals_count for summary in summaries),
+        "finished_count": sum(summary.finished_count for summary in summaries),
+        "paid_amount": sum((summary.paid_amount for summary in summaries), Decimal(0)),
+        "outstanding_amount": sum((Decimal(p["amount"]) for p in outstanding), Decimal("0.00")),
+        "active_rental": active[0] if active else None,
+        "upcoming_rental": upcoming[0] if upcoming else None,
+        "outstanding_payments": outstanding,
+    }
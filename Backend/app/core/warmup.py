@@ -0,0 +1,79 @@
+import logging
+import time
+from app.core.database import SessionLocal, engine, DB_POOL_SIZE
+from app.core.reference_data import reference_data
+from app.core.sharding import shard_router
+from app.core.similarity import fleet_features_for
+
+logger = logging.getLogger(__name__)
+
+WARM_UP_PATHS = ["/cars/?page=1", "/cars/?page=2", "/cars/?page=3"]
+
+
+def warm_up() -> float:
+    """Fill the DB pool, the reference-data cache and the fleet features before serving traffic."""
+    started = time.perf_counter()
+
+    # Modules deferred to keep imports fast; a long-lived worker loads them now
+    # rather than on its first login or authenticated request.
+    from jose import jwt  # noqa: F401
+    from app.core.security import get_pwd_context
+    get_pwd_context()
+
+    connections = [engine.connect() for _ in range(DB_POOL_SIZE)]
+    for connection in connections:
+        connection.close()
+
+    db = SessionLocal()
+    try:
+        reference_data.load(db)
+    finally:
+        db.close()
+    shard_router.fan_out(lambda shard_db: fleet_features_for(shard_db).load(shard_db))
+
+    return time.perf_counter() - started
+
+
+async def asgi_get(app, path: str, headers: list | None = None) -> tuple[int, bytes]:
+    """Run one GET through the full ASGI stack in-process, without a server or socket."""
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": headers or [],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+        "app": app,
+    }
+    status = 0
+    body = bytearray()
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, bytes(body)
+
+
+async def warm_catalog(app) -> float:
+    """Request the hot catalog pages once so routing, queries and serializers are primed."""
+    started = time.perf_counter()
+    for path in WARM_UP_PATHS:
+        status, _ = await asgi_get(app, path)
+        if status != 200:
+            logger.warning("Warm-up request %s returned %s", path, status)
+    return time.perf_counter() - started
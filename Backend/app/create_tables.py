@@ -1,4 +1,3 @@
-from core.database import Base, engine
-from models import *
+from app.core.sharding import prepare_shards
 
-Base.metadata.create_all(engine)
\ No newline at end of file
+prepare_shards()
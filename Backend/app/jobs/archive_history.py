@@ -0,0 +1,24 @@
+"""Move finished and cancelled rentals past the retention age, with their payments, to the archive tables.
+
+Run from Backend/:  python -m app.jobs.archive_history [days]
+"""
+import sys
+import time
+from app.core.sharding import shard_router
+from app.core.archive import ARCHIVE_AFTER_DAYS, archive_history
+
+
+def main():
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else ARCHIVE_AFTER_DAYS
+    for shard in shard_router.shards:
+        db = shard.session_factory()
+        try:
+            started = time.perf_counter()
+            moved = archive_history(db, days)
+            print(f"[{shard.name}] Archived {moved} rentals older than {days} days in {time.perf_counter() - started:.2f}s")
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""Drain the outbox_events table and hand new events to the registered handlers.
+
+Run exactly one dispatcher per deployment; it drains every branch database. From Backend/:
+    python -m app.jobs.dispatch_outbox           # keep running
+    python -m app.jobs.dispatch_outbox --once    # drain what is there and exit
+"""
+import logging
+import sys
+import threading
+from app.core.sharding import shard_router
+from app.core.invalidation import invalidation_bus
+from app.core.outbox import outbox_dispatcher
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    invalidation_bus.start()
+    try:
+        once = "--once" in sys.argv[1:]
+        threads = [threading.Thread(target=outbox_dispatcher.run, args=(shard.session_factory,), kwargs={"once": once},
+                                    name=f"outbox-{shard.name}", daemon=True)
+                   for shard in shard_router.shards]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        invalidation_bus.stop()
+
+
+if __name__ == "__main__":
+    main()
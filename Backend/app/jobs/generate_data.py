@@ -0,0 +1,47 @@
+"""Fill the database with a reproducible synthetic dataset: users, cars, tags, rentals and payments.
+
+The same --seed and --today always produce the same rows, and runs append, so several runs
+(or branches) can be combined. Run app.create_tables first; afterwards run
+app.jobs.rebuild_rollups and app.jobs.refresh_maintenance --full for analytics and service state.
+Run from Backend/:
+    python -m app.jobs.generate_data --users 100000 --cars 200000 --rentals-per-car 40
+    python -m app.jobs.generate_data --users 0 --cars 50000 --branch north
+"""
+import argparse
+import time
+from datetime import datetime, timezone
+from app.core.sharding import DEFAULT_BRANCH, mirror_reference_data, shard_router
+from app.core.datagen import BATCH_SIZE, generate_dataset
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--cars", type=int, default=1_000)
+    parser.add_argument("--rentals-per-car", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--today", type=datetime.fromisoformat, default=None,
+                        help="Date the bookings are laid out around (default: today), e.g. 2026-01-01")
+    parser.add_argument("--branch", default=DEFAULT_BRANCH, help="Branch whose database receives the cars and bookings")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    shard = shard_router.by_name(args.branch)
+    today = args.today.replace(tzinfo=args.today.tzinfo or timezone.utc) if args.today else None
+    started = time.perf_counter()
+
+    def report(counts: dict[str, int]) -> None:
+        rows = sum(counts.values())
+        print(f"\r{rows:,} rows, {rows / max(time.perf_counter() - started, 1e-9):,.0f} rows/s", end="", flush=True)
+
+    counts = generate_dataset(shard.engine, users=args.users, cars=args.cars, rentals_per_car=args.rentals_per_car,
+                              seed=args.seed, today=today, users_engine=shard_router.shards[0].engine,
+                              id_floor=shard.first_id, batch_size=args.batch_size, progress=report)
+    if shard.index:
+        mirror_reference_data(shard)
+    print(f"\n[{shard.name}] " + ", ".join(f"{count:,} {name}" for name, count in counts.items())
+          + f" in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
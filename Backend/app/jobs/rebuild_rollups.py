@@ -0,0 +1,22 @@
+"""Rebuild the analytics rollup tables from rental and payment history.
+
+Run from Backend/:  python -m app.jobs.rebuild_rollups
+"""
+import time
+from app.core.sharding import shard_router
+from app.core.rollups import rebuild_rollups
+
+
+def main():
+    for shard in shard_router.shards:
+        db = shard.session_factory()
+        try:
+            started = time.perf_counter()
+            rentals = rebuild_rollups(db)
+            print(f"[{shard.name}] Rebuilt rollups from {rentals} finished rentals in {time.perf_counter() - started:.2f}s")
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
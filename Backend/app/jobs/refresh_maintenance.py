@@ -0,0 +1,24 @@
+"""Recompute which cars are due for service from mileage and service history.
+
+Only cars changed since the last run are checked; pass --full to recheck the fleet.
+Run from Backend/:  python -m app.jobs.refresh_maintenance [--full]
+"""
+import sys
+import time
+from app.core.sharding import shard_router
+from app.core.maintenance import refresh_maintenance
+
+
+def main():
+    for shard in shard_router.shards:
+        db = shard.session_factory()
+        try:
+            started = time.perf_counter()
+            checked, changed = refresh_maintenance(db, full="--full" in sys.argv[1:])
+            print(f"[{shard.name}] Checked {checked} cars, {changed} changed due state in {time.perf_counter() - started:.2f}s")
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,60 @@
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+from app.core.audit import audit_log
+from app.core.compression import CompressionMiddleware
+from app.core.invalidation import invalidation_bus
+from app.core.lazy_routers import LazyRouterMiddleware, LazyRouters
+from app.core.push import push_hub
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.warmup import warm_up, warm_catalog
 from app.api import auth
 from app.api import cars
+from app.api import maintenance
+from app.api import payment
+from app.api import reference
 from app.api import rentals
 from app.api import users
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    invalidation_bus.start()
+    audit_log.start()
+    push_hub.start()
+    if os.getenv("WARM_UP", "1") == "1":
+        started = time.perf_counter()
+        try:
+            await run_in_threadpool(lazy_routers.load)
+            await run_in_threadpool(warm_up)
+            await warm_catalog(app)
+            logger.info("Worker %s warmed up in %.1f ms", os.getpid(), (time.perf_counter() - started) * 1000)
+        except Exception:
+            # A cold worker is slower, not broken; keep serving.
+            logger.exception("Worker %s warm-up failed", os.getpid())
+    yield
+    await push_hub.stop()
+    await run_in_threadpool(audit_log.stop)
+    invalidation_bus.stop()
+
+
+app = FastAPI(lifespan=lifespan)
+# Analytics, archive, audit, events and live are imported on their first request; see LAZY_ROUTERS.
+lazy_routers = LazyRouters(app)
+app.add_middleware(LazyRouterMiddleware, routers=lazy_routers)
+app.add_middleware(CompressionMiddleware, minimum_size=int(os.getenv("COMPRESSION_MIN_SIZE", "1024")))
+# Added last so it wraps everything else and rejects requests before any work is done.
+app.add_middleware(RateLimitMiddleware, enabled=os.getenv("RATE_LIMIT_ENABLED", "1") == "1")
 app.include_router(auth.router)
 app.include_router(cars.router)
+app.include_router(maintenance.router)
+app.include_router(payment.router)
+app.include_router(reference.router)
 app.include_router(rentals.router)
 app.include_router(users.router)
 
@@ -0,0 +1,33 @@
+from datetime import date
+from sqlalchemy import Date, DECIMAL, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+
+
+class CarDailyStats(Base):
+    __tablename__ = "car_daily_stats"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    car_id: Mapped[int] = mapped_column(ForeignKey("cars.id", ondelete="CASCADE"), primary_key=True)
+    type_id: Mapped[int | None] = mapped_column()
+    booked_hours: Mapped[float] = mapped_column(nullable=False, default=0)
+    rentals_finished: Mapped[int] = mapped_column(nullable=False, default=0)
+    billed_amount: Mapped[DECIMAL] = mapped_column(DECIMAL(12, 2), nullable=False, default=0)
+    paid_amount: Mapped[DECIMAL] = mapped_column(DECIMAL(12, 2), nullable=False, default=0)
+
+    def __repr__(self):
+        return f"CarDailyStats(day={self.day!r}, car_id={self.car_id!r})"
+
+
+class CarTypeDailyStats(Base):
+    __tablename__ = "car_type_daily_stats"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    type_id: Mapped[int] = mapped_column(ForeignKey("car_types.id", ondelete="CASCADE"), primary_key=True)
+    booked_hours: Mapped[float] = mapped_column(nullable=False, default=0)
+    rentals_finished: Mapped[int] = mapped_column(nullable=False, default=0)
+    billed_amount: Mapped[DECIMAL] = mapped_column(DECIMAL(12, 2), nullable=False, default=0)
+    paid_amount: Mapped[DECIMAL] = mapped_column(DECIMAL(12, 2), nullable=False, default=0)
+
+    def __repr__(self):
+        return f"CarTypeDailyStats(day={self.day!r}, type_id={self.type_id!r})"
@@ -0,0 +1,48 @@
+from sqlalchemy import String, DateTime, DECIMAL, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class ArchivedRental(Base):
+    """Finished or cancelled rentals moved out of ``rentals`` by ``app.jobs.archive_history``."""
+    __tablename__ = "rentals_archive"
+    __table_args__ = (Index("ix_rentals_archive_user_end", "user_id", "end_date"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(nullable=False)
+    car_id: Mapped[int] = mapped_column(nullable=False, index=True)
+    start_date = mapped_column(DateTime(timezone=True), nullable=False)
+    end_date = mapped_column(DateTime(timezone=True), nullable=False)
+    created_at = mapped_column(DateTime(timezone=True), nullable=False)
+    started_at = mapped_column(DateTime(timezone=True), nullable=True)
+    returned_at = mapped_column(DateTime(timezone=True), nullable=True)
+    price_for_day: Mapped[DECIMAL] = mapped_column(DECIMAL(10, 2), nullable=False)
+    price_sum: Mapped[DECIMAL] = mapped_column(DECIMAL(10, 2), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    version: Mapped[int] = mapped_column(nullable=False)
+    updated_at = mapped_column(DateTime(timezone=True), nullable=True)
+    archived_at = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    payment: Mapped["ArchivedPayment"] = relationship(
+        primaryjoin="foreign(ArchivedPayment.rental_id) == ArchivedRental.id", uselist=False, viewonly=True)
+
+    def __repr__(self):
+        return f"ArchivedRental(id={self.id!r}, user_id={self.user_id!r}, car_id={self.car_id!r})"
+
+
+class ArchivedPayment(Base):
+    __tablename__ = "payments_archive"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    rental_id: Mapped[int] = mapped_column(nullable=False, unique=True)
+    amount: Mapped[DECIMAL] = mapped_column(DECIMAL(10, 2), nullable=False)
+    payment_method: Mapped[str] = mapped_column(String(30), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    paid_at = mapped_column(DateTime(timezone=True), nullable=True)
+    version: Mapped[int] = mapped_column(nullable=False)
+    updated_at = mapped_column(DateTime(timezone=True), nullable=True)
+    archived_at = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"ArchivedPayment(id={self.rental_id!r}, amount={self.amount!r})"
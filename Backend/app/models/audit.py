@@ -0,0 +1,24 @@
+from sqlalchemy import String, DateTime, Text, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+
+
+class AuditEntry(Base):
+    """Append-only trail of staff actions, written in batches by ``app.core.audit``."""
+    __tablename__ = "audit_log"
+    __table_args__ = (
+        Index("ix_audit_log_entity", "entity_type", "entity_id", "created_at"),
+        Index("ix_audit_log_actor", "actor_id", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    # When the action happened, not when the batch was written.
+    created_at = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    actor_id: Mapped[int] = mapped_column(nullable=False)
+    action: Mapped[str] = mapped_column(String(30), nullable=False)
+    entity_type: Mapped[str] = mapped_column(String(20), nullable=False)
+    entity_id: Mapped[int] = mapped_column(nullable=False)
+    detail: Mapped[str] = mapped_column(Text, nullable=False)
+
+    def __repr__(self):
+        return f"AuditEntry(id={self.id!r}, action={self.action!r}, entity_id={self.entity_id!r})"
@@ -7,6 +7,8 @@ from app.core.database import Base
 
 class Car(Base):
     __tablename__ = "cars"
+    # AUTOINCREMENT lets each branch database start its ids at its own offset (see app.core.sharding).
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id: Mapped[int] = mapped_column(primary_key=True)
     brand: Mapped[str] = mapped_column(String(30), nullable=False)
@@ -24,6 +26,8 @@ class Car(Base):
     mileage: Mapped[int] = mapped_column()
     price_per_day: Mapped[DECIMAL] = mapped_column(DECIMAL(10, 2), nullable=False)
     year: Mapped[int] = mapped_column()
+    version: Mapped[int] = mapped_column(nullable=False, default=1)
+    updated_at = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     service_history: Mapped[list["CarServiceHistory"]] = relationship(back_populates="car", cascade="all, delete-orphan")
     rentals: Mapped[list["Rental"]] = relationship(back_populates="car", cascade="all, delete-orphan")
@@ -36,6 +40,8 @@ class Car(Base):
 
     images: Mapped[list["CarImage"]] = relationship(back_populates="car", cascade="all, delete-orphan")
 
+    __mapper_args__ = {"version_id_col": version}
+
     def __repr__(self):
         return f"Car(id={self.id!r}, brand={self.brand!r}, model={self.model!r}, plate={self.plate!r}"
 
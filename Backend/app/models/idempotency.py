@@ -0,0 +1,22 @@
+from sqlalchemy import String, DateTime, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class IdempotencyRecord(Base):
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (UniqueConstraint("user_id", "endpoint", "key"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(nullable=False)
+    endpoint: Mapped[str] = mapped_column(String(50), nullable=False)
+    key: Mapped[str] = mapped_column(String(100), nullable=False)
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    status_code: Mapped[int] = mapped_column(nullable=False)
+    response_body: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"IdempotencyRecord(user_id={self.user_id!r}, endpoint={self.endpoint!r}, key={self.key!r})"
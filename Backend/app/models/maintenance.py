@@ -0,0 +1,24 @@
+from sqlalchemy import DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+
+
+class CarMaintenance(Base):
+    """Service due state per car, derived from ``car_service_history`` and ``cars.mileage``.
+
+    For a car with no service on record (``last_service_id`` 0) the ``last_service_*`` columns
+    hold the date and mileage at which it was first seen.
+    """
+    __tablename__ = "car_maintenance"
+
+    car_id: Mapped[int] = mapped_column(ForeignKey("cars.id", ondelete="CASCADE"), primary_key=True)
+    last_service_id: Mapped[int] = mapped_column(nullable=False, default=0)
+    last_service_date = mapped_column(DateTime(timezone=True), nullable=True)
+    last_service_mileage: Mapped[int] = mapped_column(nullable=False, default=0)
+    due_mileage: Mapped[int] = mapped_column(nullable=False)
+    due_date = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+    is_due: Mapped[bool] = mapped_column(nullable=False, default=False, index=True)
+    computed_at = mapped_column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"CarMaintenance(car_id={self.car_id!r}, is_due={self.is_due!r})"
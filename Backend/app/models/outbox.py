@@ -0,0 +1,20 @@
+from sqlalchemy import String, DateTime, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+    # /events readers page by id, so ids must not be reused after dispatched events are purged.
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(30), nullable=False)
+    entity_id: Mapped[int] = mapped_column(nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    dispatched_at = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+
+    def __repr__(self):
+        return f"OutboxEvent(id={self.id!r}, event_type={self.event_type!r}, entity_id={self.entity_id!r})"
@@ -1,4 +1,4 @@
-from sqlalchemy import String, DateTime, Enum, ForeignKey, DECIMAL
+from sqlalchemy import String, DateTime, Enum, ForeignKey, DECIMAL, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -8,29 +8,37 @@ from app.core.database import Base
 
 class Rental(Base):
     __tablename__ = "rentals"
+    __table_args__ = (Index("ix_rentals_user_status", "user_id", "status"), {"sqlite_autoincrement": True})
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # No foreign key: with several branch databases, users live in another database.
+    user_id: Mapped[int] = mapped_column(nullable=False)
     car_id: Mapped[int] = mapped_column(ForeignKey("cars.id", ondelete="CASCADE"), nullable=False)
     start_date = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     end_date = mapped_column(DateTime(timezone=True), nullable=False)
     created_at = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = mapped_column(DateTime(timezone=True), nullable=True)
     returned_at = mapped_column(DateTime(timezone=True), nullable=True)
     price_for_day: Mapped[DECIMAL] = mapped_column(DECIMAL(10, 2), nullable=False) 
     price_sum: Mapped[DECIMAL] = mapped_column(DECIMAL(10, 2), nullable=False)
     status: Mapped[str] = mapped_column(Enum("NOT_STARTED", "ACTIVE", "FINISHED", "CANCELLED", native_enum=False), default="NOT_STARTED")
+    version: Mapped[int] = mapped_column(nullable=False, default=1)
+    updated_at = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
-    user: Mapped["User"] = relationship(back_populates="rentals")
+    user: Mapped["User"] = relationship(back_populates="rentals", primaryjoin="foreign(Rental.user_id) == User.id")
     car: Mapped["Car"] = relationship(back_populates="rentals")
 
     payment: Mapped["Payment"] = relationship(back_populates="rental" , cascade="all, delete-orphan", uselist=False)
 
+    __mapper_args__ = {"version_id_col": version}
+
     def __repr__(self):
         return f"Rentals(id={self.id!r}, user_id={self.user_id!r}), car_id={self.car_id!r})"
     
 
 class Payment(Base): 
     __tablename__ = "payments"
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id: Mapped[int] = mapped_column(primary_key=True)
     rental_id: Mapped[int] = mapped_column(ForeignKey("rentals.id", ondelete="CASCADE"), nullable=False, unique=True)
@@ -38,8 +46,12 @@ class Payment(Base):
     payment_method: Mapped[str] = mapped_column(String(30), nullable=False)
     status: Mapped[str] = mapped_column(Enum("PAID", "NOT_PAID", native_enum=False), nullable=False)
     paid_at = mapped_column(DateTime(timezone=True), server_default=func.now())
+    version: Mapped[int] = mapped_column(nullable=False, default=1)
+    updated_at = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     rental: Mapped["Rental"] = relationship(back_populates="payment")
 
+    __mapper_args__ = {"version_id_col": version}
+
     def __repr__(self):
         return f"Payments(id={self.rental_id!r}, amount={self.amount!r})"
\ No newline at end of file
@@ -19,7 +19,8 @@ class User(Base):
     created_at = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = mapped_column(DateTime(timezone=True), onupdate=func.now())
 
-    rentals: Mapped[list["Rental"]] = relationship(back_populates="user", cascade="all, delete-orphan")
+    rentals: Mapped[list["Rental"]] = relationship(back_populates="user", cascade="all, delete-orphan",
+                                                   primaryjoin="User.id == foreign(Rental.user_id)")
 
     def __repr__(self) -> str:
         return f"User(id={self.id!r}, first_name={self.first_name!r}, last_name={self.last_name!r}, email={self.email!r}, role={self.role!r})"
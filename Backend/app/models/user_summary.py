@@ -0,0 +1,23 @@
+from sqlalchemy import DateTime, DECIMAL, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class UserRentalSummary(Base):
+    __tablename__ = "user_rental_summaries"
+
+    # No foreign key: summaries live in the branch databases, users in the default one.
+    user_id: Mapped[int] = mapped_column(primary_key=True)
+    rentals_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    finished_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    paid_amount: Mapped[DECIMAL] = mapped_column(DECIMAL(12, 2), nullable=False, default=0)
+    # JSON snapshot of the active and upcoming rentals and unpaid payments.
+    open_items: Mapped[str] = mapped_column(Text, nullable=False)
+    version: Mapped[int] = mapped_column(nullable=False, default=1)
+    updated_at = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __mapper_args__ = {"version_id_col": version}
+
+    def __repr__(self):
+        return f"UserRentalSummary(user_id={self.user_id!r}, rentals_count={self.rentals_count!r})"
@@ -0,0 +1,15 @@
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class CollectionVersion(Base):
+    __tablename__ = "collection_versions"
+
+    name: Mapped[str] = mapped_column(String(30), primary_key=True)
+    version: Mapped[int] = mapped_column(nullable=False, default=0)
+    updated_at = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"CollectionVersion(name={self.name!r}, version={self.version!r})"
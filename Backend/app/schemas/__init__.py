@@ -1,3 +1,5 @@
+# Schemas used only by the lazily mounted routers (analytics, event, audit) are imported by those routers.
 from .user import *
 from .car import *
-from .rental import *
\ No newline at end of file
+from .rental import *
+from .maintenance import *
@@ -0,0 +1,31 @@
+from datetime import date
+from enum import Enum
+from decimal import Decimal
+from pydantic import BaseModel
+
+
+class AnalyticsPeriod(str, Enum):
+    DAY = "day"
+    MONTH = "month"
+
+
+class RevenueRowSchema(BaseModel):
+    period: str
+    type_id: int
+    rentals_finished: int
+    billed_amount: Decimal
+    paid_amount: Decimal
+
+
+class UtilizationRowSchema(BaseModel):
+    type_id: int
+    cars: int
+    booked_hours: float
+    available_hours: float
+    utilization: float
+
+
+class UtilizationResponseSchema(BaseModel):
+    date_from: date
+    date_to: date
+    items: list[UtilizationRowSchema]
@@ -0,0 +1,12 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class AuditEntrySchema(BaseModel):
+    id: int
+    created_at: datetime
+    actor_id: int
+    action: str
+    entity_type: str
+    entity_id: int
+    detail: dict
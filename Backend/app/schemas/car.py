@@ -1,7 +1,8 @@
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 import re
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, create_model, field_validator
 
 
 class CarStatus(str, Enum):
@@ -192,6 +193,24 @@ class CarResponseSchema(BaseModel):
     model_config = {"from_attributes": True}
 
 
+CAR_SCALAR_FIELDS = (
+    "id", "brand", "model", "status", "condition", "plate", "seats", "doors",
+    "color", "fuel_per_km", "mileage", "price_per_day", "year",
+)
+CAR_RELATION_FIELDS = ("car_type", "fuel_type", "gearbox_type", "images", "tags")
+
+
+@lru_cache(maxsize=256)
+def car_projection_schema(fields: tuple[str, ...], expand: tuple[str, ...]) -> type[BaseModel]:
+    # Slim variant of CarResponseSchema holding only the requested fields and relations.
+    definitions = {name: (CarResponseSchema.model_fields[name].annotation, ...) for name in fields + expand}
+    return create_model(
+        "CarProjectionSchema",
+        __config__={"from_attributes": True},
+        **definitions,
+    )
+
+
 class PaginatedCarResponse(BaseModel):
     total: int
     page: int
@@ -202,12 +221,12 @@ class PaginatedCarResponse(BaseModel):
 
 
 class CarFilterSchema(BaseModel):
-    type: str | None
-    fuel: str | None
-    gearbox: str | None
-    price_from: float | None
-    price_to: float | None
-    tags: list[str] | None
-    seats: int | None
-    doors: int | None
+    type: str | None = None
+    fuel: str | None = None
+    gearbox: str | None = None
+    price_from: float | None = None
+    price_to: float | None = None
+    tags: list[str] | None = None
+    seats: int | None = None
+    doors: int | None = None
 
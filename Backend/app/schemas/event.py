@@ -0,0 +1,15 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class EventSchema(BaseModel):
+    id: int
+    event_type: str
+    entity_id: int
+    payload: dict
+    created_at: datetime
+
+
+class EventPageSchema(BaseModel):
+    events: list[EventSchema]
+    next_cursor: int
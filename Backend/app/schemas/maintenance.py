@@ -0,0 +1,19 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class MaintenanceSchema(BaseModel):
+    car_id: int
+    plate: str
+    mileage: int
+    last_service_date: datetime | None
+    last_service_mileage: int
+    due_mileage: int
+    due_date: datetime | None
+    is_due: bool
+
+
+class ServiceRecordCreateSchema(BaseModel):
+    description: str
+    mileage: int
+    service_date: datetime | None = None
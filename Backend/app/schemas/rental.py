@@ -50,4 +50,25 @@ class PaymentResponseSchema(BaseModel):
     status: PaymentStatus
     paid_at: datetime | None
 
-    model_config = {"from_attributes": True}
\ No newline at end of file
+    model_config = {"from_attributes": True}
+
+
+class ArchivedPaymentSchema(PaymentResponseSchema):
+    status: str
+
+
+class ArchivedRentalSchema(RentalResponseSchema):
+    status: str
+    returned_at: datetime | None
+    archived_at: datetime
+    payment: ArchivedPaymentSchema | None = None
+
+
+class UserRentalSummarySchema(BaseModel):
+    rentals_count: int
+    finished_count: int
+    paid_amount: Decimal
+    active_rental: RentalResponseSchema | None
+    upcoming_rental: RentalResponseSchema | None
+    outstanding_payments: list[PaymentResponseSchema]
+    outstanding_amount: Decimal
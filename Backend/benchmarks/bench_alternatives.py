@@ -0,0 +1,57 @@
+"""Latency of FleetFeatures ranking for /cars/{id}/alternatives on a large synthetic fleet.
+
+Run from Backend/:  python -m benchmarks.bench_alternatives [cars]
+                    python -m benchmarks.bench_alternatives --check   # fail if over benchmarks/budgets.json
+"""
+import json
+import os
+import random
+import sys
+import time
+from benchmarks.synthetic_fleet import make_fleet
+
+ARGS = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+CARS = int(ARGS[0]) if ARGS else 100_000
+QUERIES = 200
+BUDGETS_FILE = os.path.join(os.path.dirname(__file__), "budgets.json")
+
+
+def main():
+    with open(BUDGETS_FILE) as f:
+        budgets = json.load(f)["alternatives"]
+    make_fleet(CARS)
+    from app.core.database import SessionLocal
+    from app.core.similarity import FleetFeatures
+
+    features = FleetFeatures()
+    db = SessionLocal()
+    started = time.perf_counter()
+    features.load(db)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    print(f"cars={CARS} load={load_ms:.0f}ms")
+    over_budget = []
+    for widen, name in ((False, "narrow"), (True, "whole_fleet")):
+        rng = random.Random(7)
+        timings = []
+        for _ in range(QUERIES):
+            car_id = rng.randint(1, CARS)
+            started = time.perf_counter()
+            features.top(db, car_id, 50, widen)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p50, p95 = timings[len(timings) // 2], timings[int(len(timings) * 0.95)]
+        print(f"  top50 {'whole fleet' if widen else 'narrow pass'}: p50={p50:.2f}ms p95={p95:.2f}ms")
+        limit = budgets.get(f"{name}_p50_ms")
+        if limit is not None and p50 > limit:
+            over_budget.append(f"{name}_p50_ms: {p50:.2f}ms > budget {limit}ms")
+    db.close()
+
+    for line in over_budget:
+        print("OVER BUDGET", line)
+    if "--check" in sys.argv[1:] and over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
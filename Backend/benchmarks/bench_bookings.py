@@ -0,0 +1,71 @@
+"""Catalog, booking overlap check and admin rental listing on a generated production-sized dataset.
+
+Loads ``app.core.datagen`` data (20 bookings per car) into a throwaway database; requests
+run in-process through the full ASGI stack.
+
+Run from Backend/:  python -m benchmarks.bench_bookings [cars]
+"""
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import timedelta
+import benchmarks.synthetic_fleet  # noqa: F401  (points DATABASE_URL at a temporary file)
+
+CARS = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+RUNS = 5
+PATHS = [
+    "/cars/?page=1",
+    "/cars/?type=SUV&fuel=Diesel&sort=brand,-mileage",
+    "/cars/?tags=GPS&sort=-price_per_day&fields=brand,price_per_day",
+]
+
+
+async def measure(app, path: str, headers: list | None = None) -> float:
+    from app.core.warmup import asgi_get
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        status, _ = await asgi_get(app, path, headers)
+        timings.append((time.perf_counter() - started) * 1000)
+        assert status == 200, (path, status)
+    return statistics.median(timings)
+
+
+def main():
+    os.environ["RATE_LIMIT_ENABLED"] = "0"
+    from app.core.database import SessionLocal, engine
+    from app.core.datagen import generate_dataset
+    from app.api.auth import create_access_token
+    from app.main import app
+    from app.models.rental import Rental
+
+    started = time.perf_counter()
+    counts = generate_dataset(engine, users=CARS // 2, cars=CARS)
+    print(f"loaded {sum(counts.values()):,} rows in {time.perf_counter() - started:.1f}s")
+
+    for path in PATHS:
+        print(f"{path:<66} {asyncio.run(measure(app, path)):7.1f}ms")
+
+    # User 1 is the generated admin.
+    admin = [(b"authorization", f"Bearer {create_access_token('user1@example.com', 1, 'ADMIN', timedelta(hours=1))}".encode())]
+    print(f"{'/rentals/ (admin, all rentals)':<66} {asyncio.run(measure(app, '/rentals/', admin)):7.1f}ms")
+
+    # The overlap query create_rental runs before every booking.
+    rng = random.Random(1)
+    db = SessionLocal()
+    timings = []
+    for car_id in rng.sample(range(1, CARS + 1), 200):
+        start = db.query(Rental.start_date).filter(Rental.car_id == car_id).order_by(Rental.id.desc()).limit(1).scalar()
+        started = time.perf_counter()
+        db.query(Rental).filter(Rental.car_id == car_id, Rental.status != "CANCELLED",
+                                Rental.end_date > start, Rental.start_date < start + timedelta(days=3)).first()
+        timings.append((time.perf_counter() - started) * 1000)
+    db.close()
+    print(f"{'create_rental overlap check':<66} {statistics.median(timings):7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
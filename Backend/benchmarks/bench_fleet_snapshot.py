@@ -0,0 +1,70 @@
+"""list_cars through the SQL path versus the in-memory FleetSnapshot on a large synthetic fleet.
+
+Requests run in-process through the full ASGI stack; If-None-Match is never sent, so
+every request does the full query.
+
+Run from Backend/:  python -m benchmarks.bench_fleet_snapshot [cars]
+                    python -m benchmarks.bench_fleet_snapshot --check   # fail unless the snapshot beats SQL everywhere
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+from benchmarks.synthetic_fleet import make_fleet
+
+ARGS = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+CARS = int(ARGS[0]) if ARGS else 100_000
+RUNS = 5
+PATHS = [
+    "/cars/?page=1",
+    "/cars/?page=50&sort=-year,price_per_day",
+    "/cars/?type=type2&fuel=fuel1&sort=brand,-mileage",
+    "/cars/?price_from=50&price_to=120&seats=5&sort=fuel_per_km",
+    "/cars/?tags=tag3&sort=-price_per_day&fields=brand,price_per_day",
+]
+
+
+async def measure(app, path: str) -> float:
+    from app.core.warmup import asgi_get
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        status, _ = await asgi_get(app, path)
+        timings.append((time.perf_counter() - started) * 1000)
+        assert status == 200, (path, status)
+    return statistics.median(timings)
+
+
+def main():
+    os.environ["RATE_LIMIT_ENABLED"] = "0"
+    make_fleet(CARS)
+    from app.core.database import SessionLocal
+    from app.core.fleet_snapshot import fleet_snapshot
+    from app.core.http_cache import get_collection_version
+    from app.main import app
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    fleet_snapshot.refresh(db, get_collection_version(db, "cars")[0])
+    print(f"cars={CARS} snapshot load={(time.perf_counter() - started) * 1000:.0f}ms")
+    db.close()
+
+    slower = []
+    for path in PATHS:
+        fleet_snapshot.enabled = False
+        sql_ms = asyncio.run(measure(app, path))
+        fleet_snapshot.enabled = True
+        snapshot_ms = asyncio.run(measure(app, path))
+        print(f"{path:<66} sql={sql_ms:7.1f}ms  snapshot={snapshot_ms:7.1f}ms  x{sql_ms / snapshot_ms:5.1f}")
+        if snapshot_ms >= sql_ms:
+            slower.append(path)
+
+    if slower:
+        print("snapshot not faster than SQL for: " + ", ".join(slower))
+        if "--check" in sys.argv[1:]:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Fan-out cost of PushHub with many idle and active live connections.
+
+Idle connections never read (a backgrounded tab), so they exercise the bounded
+queue and resync path; active ones are drained by a consumer task each.
+
+Run from Backend/:  python -m benchmarks.bench_push
+"""
+import asyncio
+import json
+import time
+from app.core.push import PushHub
+
+EVENTS = 200
+
+
+async def run(idle: int, active: int) -> tuple[float, float]:
+    hub = PushHub()
+    for _ in range(idle):
+        hub.subscribe()
+    received = [0]
+
+    async def consume(subscription):
+        while True:
+            await subscription.queue.get()
+            received[0] += 1
+
+    consumers = [asyncio.create_task(consume(hub.subscribe())) for _ in range(active)]
+    message = json.dumps({"id": 1, "type": "car.updated", "car_id": 1, "status": "UNAVAILABLE"})
+
+    broadcast_time = 0.0
+    start = time.perf_counter()
+    for _ in range(EVENTS):
+        started = time.perf_counter()
+        hub.broadcast(message)
+        broadcast_time += time.perf_counter() - started
+        await asyncio.sleep(0)
+    while received[0] < EVENTS * active:
+        await asyncio.sleep(0)
+    delivered = time.perf_counter() - start
+
+    for consumer in consumers:
+        consumer.cancel()
+    backlog = max(subscription.queue.qsize() for subscription in hub._subscriptions)
+    assert backlog <= hub.queue_size
+    return broadcast_time / EVENTS * 1e3, delivered / EVENTS * 1e3
+
+
+def main():
+    for idle, active in ((1_000, 0), (10_000, 0), (1_000, 1_000), (5_000, 5_000)):
+        broadcast_ms, delivered_ms = asyncio.run(run(idle, active))
+        print(f"idle={idle:<6} active={active:<6} broadcast={broadcast_ms:.2f}ms/event  "
+              f"delivered_to_all={delivered_ms:.2f}ms/event")
+
+
+if __name__ == "__main__":
+    main()
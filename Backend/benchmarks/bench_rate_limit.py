@@ -0,0 +1,47 @@
+"""Overhead of RateLimitMiddleware on the catalog hot path.
+
+Run from Backend/:  python -m benchmarks.bench_rate_limit
+"""
+import asyncio
+import time
+from app.core.rate_limit import RateLimitMiddleware
+
+REQUESTS = 100_000
+
+
+async def plain_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    pass
+
+
+async def run(app, clients: int) -> float:
+    scopes = [
+        {"type": "http", "method": "GET", "path": "/cars/", "headers": [], "client": (f"10.0.{i // 256}.{i % 256}", 1234)}
+        for i in range(clients)
+    ]
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        await app(scopes[i % clients], receive, send)
+    return (time.perf_counter() - start) / REQUESTS * 1e6
+
+
+def main():
+    # Each client stays under the default burst capacity, so every request is admitted.
+    for clients in (1_000, 10_000):
+        limited = RateLimitMiddleware(plain_app)
+        baseline = asyncio.run(run(plain_app, clients))
+        with_limiter = asyncio.run(run(limited, clients))
+        print(f"clients={clients:<5} baseline={baseline:.2f}us/req  rate_limited={with_limiter:.2f}us/req  "
+              f"overhead={with_limiter - baseline:.2f}us/req")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Worker startup cost: import time, warm-up time and first-request latency.
+
+Each measurement runs in a fresh interpreter so nothing is cached between runs.
+``app_import_ms`` times ``import app.main`` after FastAPI, SQLAlchemy and Pydantic
+are already loaded, i.e. the part of the import this project controls.
+
+Run from Backend/:
+    python -m benchmarks.bench_startup            # report
+    python -m benchmarks.bench_startup --check    # fail if over benchmarks/budgets.json
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RUNS = 5
+BUDGETS_FILE = os.path.join(os.path.dirname(__file__), "budgets.json")
+METRICS = ("import_ms", "app_import_ms", "warmup_ms", "first_ms", "second_ms")
+
+CHILD = r"""
+import asyncio, json, os, sys, time
+started = time.perf_counter()
+import fastapi, fastapi.security, pydantic, sqlalchemy, sqlalchemy.orm, starlette.responses
+third_party_ms = (time.perf_counter() - started) * 1000
+started = time.perf_counter()
+import app.main
+app_import_ms = (time.perf_counter() - started) * 1000
+
+from app.core.database import Base, engine
+Base.metadata.create_all(engine)
+
+from app.core.warmup import asgi_get, warm_up, warm_catalog
+warmup_ms = 0.0
+if sys.argv[1] == "warm":
+    started = time.perf_counter()
+    warm_up()
+    asyncio.run(warm_catalog(app.main.app))
+    warmup_ms = (time.perf_counter() - started) * 1000
+
+started = time.perf_counter()
+status, _ = asyncio.run(asgi_get(app.main.app, "/cars/"))
+first_ms = (time.perf_counter() - started) * 1000
+started = time.perf_counter()
+asyncio.run(asgi_get(app.main.app, "/cars/"))
+second_ms = (time.perf_counter() - started) * 1000
+print(json.dumps({"status": status, "import_ms": third_party_ms + app_import_ms, "app_import_ms": app_import_ms,
+                  "warmup_ms": warmup_ms, "first_ms": first_ms, "second_ms": second_ms}))
+"""
+
+
+def measure(mode: str) -> dict:
+    results = []
+    for _ in range(RUNS):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, DATABASE_URL=f"sqlite+pysqlite:///{tmp}/bench.db", SQL_ECHO="0",
+                       RATE_LIMIT_ENABLED="0", CACHE_BUS_DIR=os.path.join(tmp, "bus"))
+            out = subprocess.run([sys.executable, "-c", CHILD, mode], env=env, capture_output=True, text=True, check=True)
+            results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {key: statistics.median(r[key] for r in results) for key in METRICS}
+
+
+def main():
+    check = "--check" in sys.argv[1:]
+    with open(BUDGETS_FILE) as f:
+        budgets = json.load(f)["startup"]
+
+    over_budget = []
+    for mode in ("cold", "warm"):
+        r = measure(mode)
+        print(f"{mode:<5} import={r['import_ms']:.1f}ms (app {r['app_import_ms']:.1f}ms) warm-up={r['warmup_ms']:.1f}ms "
+              f"first-request={r['first_ms']:.2f}ms second-request={r['second_ms']:.2f}ms")
+        for metric, limit in budgets.get(mode, {}).items():
+            if r[metric] > limit:
+                over_budget.append(f"{mode}.{metric}: {r[metric]:.1f}ms > budget {limit}ms")
+
+    for line in over_budget:
+        print("OVER BUDGET", line)
+    if check and over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Import-time profile of app.main, heaviest modules first.
+
+Also times each router in app.core.lazy_routers.LAZY_ROUTERS, mounted after app.main the
+way its first request (or warm-up) mounts it, i.e. the import time kept out of app.main.
+
+Run from Backend/:  python -m benchmarks.profile_imports [limit]
+"""
+import json
+import os
+import subprocess
+import sys
+
+LAZY_CHILD = r"""
+import json, time
+import app.main
+from app.core.lazy_routers import LAZY_ROUTERS
+timings = {}
+for prefix in LAZY_ROUTERS:
+    started = time.perf_counter()
+    app.main.lazy_routers.load(prefix)
+    timings[prefix] = (time.perf_counter() - started) * 1000
+print(json.dumps(timings))
+"""
+
+
+def main():
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 25
+    env = dict(os.environ, SQL_ECHO="0")
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"],
+                         env=env, capture_output=True, text=True, check=True)
+
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(cumulative_us), int(self_us), name))
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:limit]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+    out = subprocess.run([sys.executable, "-c", LAZY_CHILD], env=env, capture_output=True, text=True, check=True)
+    timings = json.loads(out.stdout.strip().splitlines()[-1])
+    print(f"\ndeferred until first request: {sum(timings.values()):.1f} ms")
+    for prefix, ms in timings.items():
+        print(f"{ms:>14.1f}            {prefix}")
+
+
+if __name__ == "__main__":
+    main()
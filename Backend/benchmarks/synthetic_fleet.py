@@ -0,0 +1,34 @@
+"""A throwaway SQLite database with a random fleet, shared by the catalog benchmarks.
+
+Import this before anything from ``app``: it points DATABASE_URL at a temporary file.
+"""
+import os
+import random
+import tempfile
+
+TYPES, FUELS, GEARBOXES, TAGS = 6, 4, 2, 12
+
+os.environ["DATABASE_URL"] = f"sqlite+pysqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+os.environ["SQL_ECHO"] = "0"
+
+
+def make_fleet(cars: int, seed: int = 42) -> None:
+    from app.core.database import Base, engine
+    from app.models.car import Car, CarTags, CarType, FuelType, GearboxType, Tag
+
+    Base.metadata.create_all(engine)
+    rng = random.Random(seed)
+    rows = [{"id": i, "brand": rng.choice(("VW", "BMW", "Audi", "Skoda", "Toyota")), "model": "M", "status": "AVAILABLE",
+             "condition": "good", "plate": f"B{i}", "type_id": rng.randint(1, TYPES), "fuel_id": rng.randint(1, FUELS),
+             "gearbox_id": rng.randint(1, GEARBOXES), "seats": rng.choice((2, 4, 5, 7)), "doors": rng.choice((3, 5)),
+             "color": "red", "fuel_per_km": round(rng.uniform(0.04, 0.12), 3), "mileage": rng.randint(0, 200_000),
+             "price_per_day": rng.randint(30, 300), "year": rng.randint(2010, 2024), "version": 1}
+            for i in range(1, cars + 1)]
+    car_tags = [{"car_id": i, "tag_id": tag} for i in range(1, cars + 1) for tag in rng.sample(range(1, TAGS + 1), 3)]
+    with engine.begin() as connection:
+        connection.execute(CarType.__table__.insert(), [{"id": i, "name": f"type{i}"} for i in range(1, TYPES + 1)])
+        connection.execute(FuelType.__table__.insert(), [{"id": i, "name": f"fuel{i}"} for i in range(1, FUELS + 1)])
+        connection.execute(GearboxType.__table__.insert(), [{"id": i, "name": f"gearbox{i}"} for i in range(1, GEARBOXES + 1)])
+        connection.execute(Tag.__table__.insert(), [{"id": i, "name": f"tag{i}"} for i in range(1, TAGS + 1)])
+        connection.execute(Car.__table__.insert(), rows)
+        connection.execute(CarTags.__table__.insert(), car_tags)
@@ -0,0 +1,24 @@
+# Production entry point:  gunicorn -c gunicorn.conf.py app.main:app
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+# Request handlers are sync and mostly wait on the database, so one worker per core
+# plus one keeps every core busy without oversubscribing SQLite's single writer.
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() + 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+# Import the app once in the master; forked workers share those pages copy-on-write.
+# Connections, caches and the invalidation bus are created per worker in the lifespan hook.
+preload_app = True
+timeout = int(os.getenv("WORKER_TIMEOUT", "30"))
+graceful_timeout = 20
+keepalive = 5
+max_requests = int(os.getenv("MAX_REQUESTS", "10000"))
+max_requests_jitter = 1000
+accesslog = "-"
+
+
+def post_fork(server, worker):
+    # The engine was created in the master; never reuse its connections in a child.
+    from app.core.database import engine
+    engine.dispose(close=False)
@@ -0,0 +1,52 @@
+import os
+
+os.environ.setdefault("SQL_ECHO", "0")
+
+from collections import defaultdict
+from datetime import datetime, timezone
+from sqlalchemy import create_engine, delete, select
+from app.core.datagen import generate_dataset
+from app.models.car import Car, CarTags
+from app.models.rental import Payment, Rental
+from app.models.user import User
+
+TODAY = datetime(2026, 1, 1, tzinfo=timezone.utc)
+MODELS = (User, Car, CarTags, Rental, Payment)
+
+
+def dump(engine) -> dict:
+    with engine.connect() as connection:
+        return {model.__tablename__: connection.execute(select(model.__table__).order_by(*model.__table__.primary_key))
+                .all() for model in MODELS}
+
+
+def test_same_seed_gives_same_rows(tmp_path):
+    dumps = []
+    for name in ("a.db", "b.db"):
+        engine = create_engine(f"sqlite:///{tmp_path / name}")
+        generate_dataset(engine, users=20, cars=15, rentals_per_car=12, seed=7, today=TODAY)
+        dumps.append(dump(engine))
+    assert dumps[0] == dumps[1]
+    assert len(dumps[0]["rentals"]) > 0
+
+
+def test_bookings_never_overlap_and_use_existing_users(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'data.db'}")
+    generate_dataset(engine, users=30, cars=0, seed=1, today=TODAY)
+    # Leave gaps in the user ids; bookings generated without new users must skip them.
+    with engine.begin() as connection:
+        connection.execute(delete(User).where(User.id % 3 == 0))
+    generate_dataset(engine, users=0, cars=15, rentals_per_car=12, seed=1, today=TODAY)
+
+    with engine.connect() as connection:
+        user_ids = set(connection.scalars(select(User.id)))
+        rentals = connection.execute(select(Rental.car_id, Rental.user_id, Rental.start_date, Rental.end_date)).all()
+    assert rentals and {rental.user_id for rental in rentals} <= user_ids
+
+    by_car = defaultdict(list)
+    for rental in rentals:
+        by_car[rental.car_id].append((rental.start_date, rental.end_date))
+    for bookings in by_car.values():
+        bookings.sort()
+        for (_, end), (next_start, _) in zip(bookings, bookings[1:]):
+            assert end <= next_start